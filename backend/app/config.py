@@ -4,6 +4,79 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     CORS_ORIGINS: list[str] = ["http://localhost:3000", "http://localhost"]
     YOUTUBE_API_KEY: str = ""
+    # "async" serves /analyze with the asyncio fetcher, "threaded" runs the
+    # blocking fetcher on a dedicated bounded thread pool
+    YOUTUBE_FETCHER_MODE: str = "async"
+    FETCH_EXECUTOR_MAX_WORKERS: int = 8
+    FETCH_EXECUTOR_MAX_QUEUE: int = 32
+    # Per-connection transport timeouts, in seconds
+    YOUTUBE_CONNECT_TIMEOUT: float = 5.0
+    YOUTUBE_READ_TIMEOUT: float = 15.0
+    YOUTUBE_WRITE_TIMEOUT: float = 15.0
+    YOUTUBE_POOL_TIMEOUT: float = 5.0
+    # Transports per blocking fetcher; each in-flight API call holds one
+    YOUTUBE_TRANSPORT_POOL_SIZE: int = 16
+    # Data API quota: daily units, token-bucket smoothing, and the share of the
+    # budget held back from batch work for interactive requests
+    YOUTUBE_DAILY_QUOTA: int = 10000
+    YOUTUBE_QUOTA_REFILL_PER_SECOND: float = 2.0
+    YOUTUBE_QUOTA_BURST: int = 1000
+    YOUTUBE_QUOTA_INTERACTIVE_RESERVE: float = 0.2
+    YOUTUBE_QUOTA_MAX_WAIT: float = 10.0
+    # Units used per Pacific-time quota day, shared by every process using the file
+    YOUTUBE_QUOTA_USAGE_PATH: str = "data/quota_usage.sqlite3"
+    # Handle -> channel ID cache; unresolvable handles use the shorter negative TTL
+    CHANNEL_CACHE_PATH: str = "data/channel_ids.sqlite3"
+    CHANNEL_CACHE_MAX_ENTRIES: int = 10000
+    CHANNEL_CACHE_TTL: float = 30 * 24 * 3600
+    CHANNEL_CACHE_NEGATIVE_TTL: float = 3600
+    # ETag-revalidated Data API responses; rows unrevalidated for MAX_AGE are dropped
+    RESPONSE_CACHE_PATH: str = "data/responses.sqlite3"
+    RESPONSE_CACHE_MAX_ENTRIES: int = 2000
+    RESPONSE_CACHE_MAX_AGE: float = 7 * 24 * 3600
+    # How long cached responses are served without any API call, per resource
+    # kind; scaled by channel activity within [MIN_SCALE, MAX_SCALE]
+    RESPONSE_TTL_CHANNEL: float = 6 * 3600
+    RESPONSE_TTL_UPLOADS_PAGE: float = 3600
+    RESPONSE_TTL_VIDEO_STATS: float = 1800
+    RESPONSE_TTL_COMMENT_PAGE: float = 3600
+    RESPONSE_TTL_MIN_SCALE: float = 0.25
+    RESPONSE_TTL_MAX_SCALE: float = 24.0
+    # Fetch only statistics for every upload, full details only for the selected videos
+    YOUTUBE_TWO_PASS_DETAILS: bool = False
+    # How long videos/channels ID lookups wait to be merged with concurrent ones
+    YOUTUBE_BATCH_WINDOW: float = 0.005
+    # Retries may add at most RATIO x calls (plus a small per-second floor);
+    # an endpoint failing THRESHOLD times in a row fails fast for RESET_TIMEOUT
+    RETRY_BUDGET_RATIO: float = 0.2
+    RETRY_BUDGET_MIN_PER_SECOND: float = 0.5
+    RETRY_BUDGET_MAX_TOKENS: float = 20.0
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RESET_TIMEOUT: float = 30.0
+    # Quota units one handle resolution may spend on 100-unit search fallbacks
+    HANDLE_SEARCH_BUDGET: int = 200
+    # Whole analysis results: fresh for TTL, then served stale for STALE_TTL while
+    # refreshed; BACKEND picks the shared tier: "sqlite", "redis" or "memory"
+    RESULT_CACHE_BACKEND: str = "sqlite"
+    RESULT_CACHE_PATH: str = "data/results.sqlite3"
+    RESULT_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    RESULT_CACHE_MAX_ENTRIES: int = 500
+    RESULT_CACHE_TTL: float = 3600
+    RESULT_CACHE_STALE_TTL: float = 6 * 3600
+    RESULT_CACHE_EARLY_BETA: float = 1.0
+    # /analyze/batch: links accepted per request and analyses run at once
+    BATCH_MAX_LINKS: int = 200
+    BATCH_MAX_CONCURRENCY: int = 8
+    # Background analysis jobs: journal, worker count and how long finished jobs are kept
+    JOBS_DB_PATH: str = "data/jobs.sqlite3"
+    JOB_WORKERS: int = 2
+    JOB_RETENTION: float = 7 * 24 * 3600
+    # Running jobs hold a lease renewed every HEARTBEAT_INTERVAL; a job whose lease
+    # lapses for LEASE_TTL (its process died) is rerun by another process
+    JOB_LEASE_TTL: float = 60.0
+    JOB_HEARTBEAT_INTERVAL: float = 15.0
+    # Shared pool that enforces per-call deadlines for the blocking fetcher
+    DEADLINE_MAX_WORKERS: int = 32
 
     class Config:
         env_file = ".env"
@@ -1,14 +1,34 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from typing import Any, AsyncIterator, Dict, List, Optional
+import asyncio
+import json
+from pydantic import BaseModel, Field, field_validator
 from .config import settings
-from .services.analyzer import analyze_link
+from .services.analyzer import analyze_link, analyze_batch, stream_link
+from .services.fetchers import init_fetchers, close_fetchers, collect_stats
+from .services.jobs import get_job_runner
+from .services.executor import ExecutorSaturatedError
+from .services.quota import QuotaExceededError
+from .services.retry import CircuitOpenError
+from .services.youtube_client import check_field_mask_sites
 from .logger import logger
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+  init_fetchers()
+  get_job_runner().start()
+  yield
+  await get_job_runner().stop()
+  await close_fetchers()
+
 app = FastAPI(
   title="Audience Pulse Backend API (MVP)",
   description="API for analyzing public social media data.",
   version="0.1.0",
+  lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -25,11 +45,114 @@ async def read_root():
   return {"message": "Audience Pulse API is live"}
 
 
-class AnalyzeRequestModel(BaseModel):
+class FieldMasksModel(BaseModel):
+    # Per call site fields= projections replacing the defaults; null fetches whole parts
+    field_masks: Optional[Dict[str, Optional[str]]] = None
+
+    @field_validator("field_masks")
+    @classmethod
+    def valid_field_masks(cls, value):
+        check_field_mask_sites(value or {})
+        return value
+
+class AnalyzeRequestModel(FieldMasksModel):
     link: str
 
+class AnalyzeBatchRequestModel(FieldMasksModel):
+    links: List[str] = Field(min_length=1, max_length=settings.BATCH_MAX_LINKS)
+
+def refusal_to_http(e: Exception) -> HTTPException:
+    """Maps a locally refused analysis to its HTTP status, with Retry-After where known."""
+    if isinstance(e, CircuitOpenError):
+        headers = {"Retry-After": str(max(int(e.retry_after), 1))} if e.retry_after else None
+        return HTTPException(status_code=503, detail=str(e), headers=headers)
+    if isinstance(e, QuotaExceededError):
+        headers = {"Retry-After": str(int(e.retry_after))} if e.retry_after else None
+        return HTTPException(status_code=429, detail=str(e), headers=headers)
+    return HTTPException(status_code=503, detail=str(e))
+
+REFUSALS = (ExecutorSaturatedError, CircuitOpenError, QuotaExceededError)
+
 @app.post("/analyze")
 async def analyze(requested_data: AnalyzeRequestModel):
     logger.info(f"Received analysis request for link: {requested_data.link}")
-    response = analyze_link(requested_data.link)
-    return response
\ No newline at end of file
+    try:
+        response = await analyze_link(requested_data.link, requested_data.field_masks)
+    except REFUSALS as e:
+        raise refusal_to_http(e)
+    return response
+
+async def first_or_refusal(items: AsyncIterator[Any]) -> Any:
+    """Waits for a stream's first item before answering, so early refusals still get their status code."""
+    try:
+        return await anext(items)
+    except REFUSALS as e:
+        raise refusal_to_http(e)
+
+def encode_section(section: Dict[str, Any], sse: bool) -> str:
+    """One streamed section as an SSE event or an NDJSON line."""
+    if sse:
+        return f"event: {section['event']}\ndata: {json.dumps(section['data'])}\n\n"
+    return json.dumps(section) + "\n"
+
+@app.post("/analyze/stream")
+async def analyze_stream(requested_data: AnalyzeRequestModel, request: Request):
+    """Streams the analysis as sections arrive: NDJSON, or SSE when the client accepts text/event-stream."""
+    logger.info(f"Received streaming analysis request for link: {requested_data.link}")
+    sse = "text/event-stream" in request.headers.get("accept", "")
+    sections = stream_link(requested_data.link, requested_data.field_masks)
+    first = await first_or_refusal(sections)
+
+    async def body():
+        try:
+            yield encode_section(first, sse)
+            async for section in sections:
+                yield encode_section(section, sse)
+        except Exception as e:
+            # Headers are already sent; report the failure in-band
+            logger.error(f"Streamed analysis of {requested_data.link} failed: {e}")
+            yield encode_section({"event": "error", "data": {"detail": str(e)}}, sse)
+        finally:
+            await sections.aclose()
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.post("/analyze/batch")
+async def analyze_batch_links(requested_data: AnalyzeBatchRequestModel):
+    """Analyzes a list of links, streaming one NDJSON line per distinct link as each completes."""
+    logger.info(f"Received batch analysis request for {len(requested_data.links)} links")
+    results = analyze_batch(requested_data.links, requested_data.field_masks)
+    first = await first_or_refusal(results)
+
+    async def body():
+        try:
+            yield json.dumps(first) + "\n"
+            async for result in results:
+                yield json.dumps(result) + "\n"
+        finally:
+            await results.aclose()
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+@app.post("/jobs", status_code=202)
+async def create_job(requested_data: AnalyzeRequestModel):
+    """Queues the analysis as a background job and returns its ID at once."""
+    job_id = await get_job_runner().submit(requested_data.link, requested_data.field_masks)
+    return {"job_id": job_id, "status": "queued"}
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Returns the job's status, with its result once done or the sections produced so far."""
+    job = await asyncio.to_thread(get_job_runner().store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@app.get("/stats")
+async def stats():
+  # Quota usage and job counts are read from SQLite, so both run off the event loop
+  return {**await asyncio.to_thread(collect_stats), "jobs": await asyncio.to_thread(get_job_runner().stats)}
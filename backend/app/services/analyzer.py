@@ -1,41 +1,155 @@
-from urllib.parse import urlparse
+from urllib.parse import urlparse, urlencode, parse_qsl
+from typing import Any, AsyncIterator, Dict, List, Optional
+import asyncio
+import hashlib
 from ..config import settings
-from .youtube_client import YouTubeFetcher
+from .fetchers import get_youtube_fetcher, get_async_youtube_fetcher, get_fetch_executor
+from .singleflight import get_analysis_flights
+from .result_cache import get_result_cache
+from .links import FACEBOOK, INSTAGRAM, INVALID, VIDEO, YOUTUBE, route_link
 from ..logger import logger
 
-def analyze_link(link: str):
+# Query parameters that only track shares or set playback position
+IGNORED_LINK_PARAMS = {'t', 'si', 'feature', 'pp', 'ab_channel'}
+
+def normalize_link(link: str) -> str:
+    """Canonical form of a link for de-duplication: scheme, host and query order don't matter."""
+    canonical = route_link(link).canonical
+    if canonical:
+        return canonical
+    parsed = urlparse(link.strip())
+    host = (parsed.hostname or '').lower()
+    for prefix in ('www.', 'm.'):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    path = parsed.path.rstrip('/')
+    # Handles and custom URLs are case-insensitive; video IDs are not
+    if path.startswith(('/@', '/c/', '/user/')):
+        path = path.lower()
+    query = urlencode(sorted(
+        (name, value) for name, value in parse_qsl(parsed.query) if name not in IGNORED_LINK_PARAMS
+    ))
+    return f"{host}{path}?{query}" if query else f"{host}{path}"
+
+def _youtube_fetcher(field_masks: Optional[Dict[str, Optional[str]]]):
+    """Returns the configured YouTube fetcher with this request's field masks, and whether it is the threaded one."""
+    threaded = settings.YOUTUBE_FETCHER_MODE == "threaded"
+    fetcher = get_youtube_fetcher() if threaded else get_async_youtube_fetcher()
+    if field_masks:
+        fetcher = fetcher.with_config(fetcher.config.with_field_masks(field_masks))
+    return fetcher, threaded
+
+async def _analyze_youtube(link: str, fetcher, threaded: bool):
+    fetch = fetcher.get_video_data if route_link(link).kind == VIDEO else fetcher.get_channel_data
+    
+    if threaded:
+        # Blocking fetcher runs on the bounded pool, never on the event loop
+        run = lambda: get_fetch_executor().run(fetch, link)
+    else:
+        run = lambda: fetch(link)
+    
+    # Identical concurrent analyses share one fetch
+    normalized = normalize_link(link)
+    key = (normalized, settings.YOUTUBE_FETCHER_MODE, repr(fetcher.config))
+    # Both fetcher modes produce the same result, so the cache key leaves the mode out
+    cache_key = f"{normalized}#{hashlib.sha1(repr(fetcher.config).encode()).hexdigest()[:16]}"
+    return await get_result_cache().get_or_compute(cache_key, lambda: get_analysis_flights().do(key, run))
+
+async def analyze_link(link: str, field_masks: Optional[Dict[str, Optional[str]]] = None):
     """
     Parses the provided link to identify the social media platform and fetches data.
+    field_masks widens the default YouTube response projections for this request only.
     """
-    hostname = urlparse(link).hostname
-    path = urlparse(link).path
+    target = route_link(link)
 
-    if not hostname:
+    if target.platform == INVALID:
         logger.info(f"It's an unknown link - {link}")
         return {"error": "Invalid link"}
 
-    if "youtube.com" in hostname or "youtu.be" in hostname:
+    if target.platform == YOUTUBE:
         logger.info(f"It's a YouTube link - {link}")
         if not settings.YOUTUBE_API_KEY:
             logger.error("YouTube API Key is not set.")
             return {"error": "YouTube API Key is not configured."}
         
-        fetcher = YouTubeFetcher(api_key=settings.YOUTUBE_API_KEY)
-        
-        # Determine if it's a video or channel link
-        if 'watch' in path or 'youtu.be' in hostname:
-            return fetcher.get_video_data(link)
-        else:
-            return fetcher.get_channel_data(link)
+        fetcher, threaded = _youtube_fetcher(field_masks)
+        return await _analyze_youtube(link, fetcher, threaded)
 
-    elif "facebook.com" in hostname:
+    elif target.platform == FACEBOOK:
         logger.info(f"It's a Facebook link - {link}")
         return {"status": "Facebook analysis not yet implemented."}
     
-    elif "instagram.com" in hostname:
+    elif target.platform == INSTAGRAM:
         logger.info(f"It's an Instagram link - {link}")
         return {"status": "Instagram analysis not yet implemented."}
     
     else:
         logger.info(f"It's an unknown link - {link}")
-        return {"error": "Unknown or unsupported link type"}
\ No newline at end of file
+        return {"error": "Unknown or unsupported link type"}
+
+async def stream_link(link: str, field_masks: Optional[Dict[str, Optional[str]]] = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Like analyze_link, but yields a YouTube analysis section by section as each part is fetched.
+    Anything analyze_link answers without fetching comes back as a single "result" section.
+    """
+    target = route_link(link)
+
+    if target.platform != YOUTUBE or not settings.YOUTUBE_API_KEY:
+        yield {"event": "result", "data": await analyze_link(link, field_masks)}
+        return
+
+    logger.info(f"Streaming YouTube analysis - {link}")
+    fetcher, threaded = _youtube_fetcher(field_masks)
+    sections = fetcher.iter_video_data if target.kind == VIDEO else fetcher.iter_channel_data
+
+    # Each client consumes its own stream, so streams bypass single-flight
+    if threaded:
+        sections = get_fetch_executor().stream(sections, link)
+    else:
+        sections = sections(link)
+    async for section in sections:
+        yield section
+
+async def analyze_batch(links: List[str], field_masks: Optional[Dict[str, Optional[str]]] = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Analyzes many links, yielding {"link", "links", "result" or "error"} per distinct link as each completes.
+    Links that normalize alike are analyzed once and reported together under "links". The videos and
+    channels behind YouTube links are looked up up front in shared 50-ID calls, and at most
+    BATCH_MAX_CONCURRENCY analyses run at a time.
+    """
+    groups: Dict[str, List[str]] = {}
+    for link in links:
+        groups.setdefault(normalize_link(link), []).append(link)
+
+    youtube_links = [same[0] for same in groups.values() if route_link(same[0]).platform == YOUTUBE]
+    fetcher = None
+    if youtube_links and settings.YOUTUBE_API_KEY:
+        fetcher, threaded = _youtube_fetcher(field_masks)
+        if threaded:
+            fetcher = await get_fetch_executor().run(fetcher.prefetch, youtube_links)
+        else:
+            fetcher = await fetcher.prefetch(youtube_links)
+        logger.info(f"Batch of {len(links)} links: {len(groups)} distinct, {len(youtube_links)} on YouTube")
+
+    semaphore = asyncio.Semaphore(settings.BATCH_MAX_CONCURRENCY)
+
+    async def analyze_one(same: List[str]) -> Dict[str, Any]:
+        link = same[0]
+        async with semaphore:
+            try:
+                if fetcher is not None and link in youtube_links:
+                    result = await _analyze_youtube(link, fetcher, threaded)
+                else:
+                    result = await analyze_link(link, field_masks)
+            except Exception as e:
+                logger.error(f"Batch analysis of {link} failed: {e}")
+                return {"link": link, "links": same, "error": str(e)}
+        return {"link": link, "links": same, "result": result}
+
+    tasks = [asyncio.create_task(analyze_one(same)) for same in groups.values()]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,184 @@
+from concurrent.futures import Future
+from contextvars import copy_context
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Tuple
+import asyncio
+import threading
+import time
+from .quota import quota_priority
+
+# videos.list and channels.list accept at most 50 IDs per call
+MAX_IDS_PER_CALL = 50
+
+# Fetches one combined call: (resource, ids, params) -> items carrying an 'id'
+BatchFetch = Callable[[str, List[str], Dict[str, Any]], Awaitable[List[Dict[str, Any]]]]
+BlockingBatchFetch = Callable[[str, List[str], Dict[str, Any]], List[Dict[str, Any]]]
+
+class BatchStats:
+    """Thread-safe counters showing how many ID lookups each combined call served."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {"lookups": 0, "ids_requested": 0, "ids_fetched": 0, "calls": 0}
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[name] += amount
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+def batch_key(resource: str, params: Dict[str, Any]) -> Hashable:
+    # Only lookups asking for the same parts and fields can share a call
+    return (resource, tuple(sorted(params.items())))
+
+def _chunks(ids: List[str]) -> List[List[str]]:
+    return [ids[i:i + MAX_IDS_PER_CALL] for i in range(0, len(ids), MAX_IDS_PER_CALL)]
+
+def _resolve(futures: Dict[str, Any], items: List[Dict[str, Any]]) -> None:
+    by_id = {item.get('id'): item for item in items}
+    for item_id, future in futures.items():
+        if not future.done():
+            future.set_result(by_id.get(item_id))
+
+class IdBatcher:
+    """Dataloader-style batcher for ID lookups on the event loop.
+
+    Lookups arriving within `window` seconds of each other, from any request,
+    are merged into one call per 50 unique IDs. A lookup that fills a batch
+    sends it at once. Callers only wait on their own IDs; a cancelled caller
+    leaves the shared call running for everyone else. The call is made at the
+    most urgent quota priority among the callers it serves, not that of
+    whichever caller opened the window.
+    """
+
+    def __init__(self, fetch: BatchFetch, window: float):
+        self.fetch = fetch
+        self.window = window
+        self.stats = BatchStats()
+        self._pending: Dict[Hashable, Tuple[str, Dict[str, Any], Dict[str, asyncio.Future]]] = {}
+        self._timers: Dict[Hashable, asyncio.TimerHandle] = {}
+        # Most urgent (lowest) quota priority among each pending batch's callers
+        self._priorities: Dict[Hashable, int] = {}
+        self._calls = set()
+
+    async def load_many(self, resource: str, ids: List[str], **params) -> Dict[str, Any]:
+        """Returns the item for each ID (None if not found), sharing calls with concurrent lookups."""
+        loop = asyncio.get_running_loop()
+        key = batch_key(resource, params)
+        _, _, batch = self._pending.setdefault(key, (resource, params, {}))
+        self._priorities[key] = min(self._priorities.get(key, quota_priority.get()), quota_priority.get())
+        ids = list(dict.fromkeys(ids))
+        futures = {}
+        for item_id in ids:
+            if item_id not in batch:
+                batch[item_id] = loop.create_future()
+            futures[item_id] = batch[item_id]
+        self.stats.incr("lookups")
+        self.stats.incr("ids_requested", len(ids))
+
+        if len(batch) >= MAX_IDS_PER_CALL:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.window, self._flush, key)
+
+        # asyncio.wait, unlike gather, leaves the shared futures alone if we are cancelled
+        await asyncio.wait(futures.values())
+        return {item_id: future.result() for item_id, future in futures.items()}
+
+    def _flush(self, key: Hashable) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        resource, params, batch = self._pending.pop(key, (None, None, {}))
+        priority = self._priorities.pop(key, None)
+        for chunk in _chunks(list(batch)):
+            call = asyncio.ensure_future(
+                self._call(resource, params, {item_id: batch[item_id] for item_id in chunk}, priority)
+            )
+            self._calls.add(call)
+            call.add_done_callback(self._calls.discard)
+
+    async def _call(self, resource: str, params: Dict[str, Any], futures: Dict[str, asyncio.Future],
+                    priority: int) -> None:
+        # The task runs in a copy of the context that scheduled the flush; this sets its own
+        quota_priority.set(priority)
+        self.stats.incr("calls")
+        self.stats.incr("ids_fetched", len(futures))
+        try:
+            items = await self.fetch(resource, list(futures), params)
+        except BaseException as e:
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+        else:
+            _resolve(futures, items)
+
+class BlockingIdBatcher:
+    """Thread-based counterpart of IdBatcher for the blocking fetcher.
+
+    The first thread to look up IDs for a batch leads it: it waits out the
+    window so lookups from other threads can join, then issues the combined
+    calls while the others block on their results, at the most urgent quota
+    priority among all of them.
+    """
+
+    def __init__(self, fetch: BlockingBatchFetch, window: float):
+        self.fetch = fetch
+        self.window = window
+        self.stats = BatchStats()
+        self._lock = threading.Lock()
+        self._pending: Dict[Hashable, Dict[str, Future]] = {}
+        # Most urgent (lowest) quota priority among each batch's callers, by id() of the batch
+        self._priorities: Dict[int, int] = {}
+
+    def load_many(self, resource: str, ids: List[str], **params) -> Dict[str, Any]:
+        """Returns the item for each ID (None if not found), sharing calls with concurrent lookups."""
+        key = batch_key(resource, params)
+        ids = list(dict.fromkeys(ids))
+        with self._lock:
+            batch = self._pending.get(key)
+            leader = batch is None
+            if leader:
+                batch = self._pending[key] = {}
+            priority = quota_priority.get()
+            self._priorities[id(batch)] = min(self._priorities.get(id(batch), priority), priority)
+            futures = {}
+            for item_id in ids:
+                if item_id not in batch:
+                    batch[item_id] = Future()
+                futures[item_id] = batch[item_id]
+            full = len(batch) >= MAX_IDS_PER_CALL
+            if full and self._pending.get(key) is batch:
+                # Later lookups start a new batch; the leader sends this one
+                del self._pending[key]
+        self.stats.incr("lookups")
+        self.stats.incr("ids_requested", len(ids))
+
+        if leader:
+            if not full:
+                time.sleep(self.window)
+            with self._lock:
+                if self._pending.get(key) is batch:
+                    del self._pending[key]
+                priority = self._priorities.pop(id(batch))
+            context = copy_context()
+            context.run(quota_priority.set, priority)
+            for chunk in _chunks(list(batch)):
+                context.run(self._call, resource, params, {item_id: batch[item_id] for item_id in chunk})
+
+        return {item_id: future.result() for item_id, future in futures.items()}
+
+    def _call(self, resource: str, params: Dict[str, Any], futures: Dict[str, Future]) -> None:
+        self.stats.incr("calls")
+        self.stats.incr("ids_fetched", len(futures))
+        try:
+            items = self.fetch(resource, list(futures), params)
+        except BaseException as e:
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            _resolve(futures, items)
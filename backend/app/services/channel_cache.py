@@ -0,0 +1,111 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import sqlite3
+import threading
+import time
+from ..config import settings
+from ..logger import logger
+
+# Returned by ChannelIdCache.get when nothing is cached; None is a cached "not found"
+MISSING = object()
+
+class ChannelIdCache:
+    """Two-tier cache of handle/custom-URL -> channel ID: an in-memory LRU over SQLite.
+
+    Handle-to-ID mappings practically never change, so hits are kept for a long
+    TTL. Handles that could not be resolved are cached as None for a much shorter
+    negative TTL, so typos and dead links stop costing search quota without
+    hiding a channel that appears later.
+    """
+
+    def __init__(self, path: str, max_entries: int, ttl: float, negative_ttl: float):
+        """Opens (creating if needed) the SQLite store at path."""
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._memory: "OrderedDict[str, Tuple[Optional[str], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "negative_hits": 0, "misses": 0}
+
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS channel_ids ("
+            " key TEXT PRIMARY KEY, channel_id TEXT, expires_at REAL NOT NULL)"
+        )
+
+    def _remember(self, key: str, channel_id: Optional[str], expires_at: float) -> None:
+        self._memory[key] = (channel_id, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _hit(self, tier: str, channel_id: Optional[str]) -> Optional[str]:
+        self._stats["negative_hits" if channel_id is None else tier] += 1
+        return channel_id
+
+    def get(self, key: str):
+        """Returns the cached channel ID, None for a cached miss, or MISSING."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[1] > now:
+                self._memory.move_to_end(key)
+                return self._hit("memory_hits", entry[0])
+
+            row = self._db.execute(
+                "SELECT channel_id, expires_at FROM channel_ids WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[1] > now:
+                self._remember(key, row[0], row[1])
+                return self._hit("disk_hits", row[0])
+
+            self._memory.pop(key, None)
+            self._stats["misses"] += 1
+            return MISSING
+
+    def set(self, key: str, channel_id: Optional[str]) -> None:
+        """Caches a resolution result; None records that the key did not resolve."""
+        expires_at = time.time() + (self.ttl if channel_id else self.negative_ttl)
+        with self._lock:
+            self._remember(key, channel_id, expires_at)
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO channel_ids (key, channel_id, expires_at) VALUES (?, ?, ?)",
+                    (key, channel_id, expires_at),
+                )
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to persist channel ID for {key}: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """Returns hit/miss counters per tier."""
+        with self._lock:
+            return {"memory_entries": len(self._memory), **self._stats}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+def handle_cache_key(kind: str, name: str) -> str:
+    """Builds the cache key for a handle ('handle') or legacy /c/, /user/ name."""
+    # Handles and custom URLs are case-insensitive on YouTube
+    return f"{kind}:{name.lstrip('@').lower()}"
+
+_cache: Optional[ChannelIdCache] = None
+_cache_lock = threading.Lock()
+
+def get_channel_id_cache() -> ChannelIdCache:
+    """Returns the process-wide channel ID cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ChannelIdCache(
+                path=settings.CHANNEL_CACHE_PATH,
+                max_entries=settings.CHANNEL_CACHE_MAX_ENTRIES,
+                ttl=settings.CHANNEL_CACHE_TTL,
+                negative_ttl=settings.CHANNEL_CACHE_NEGATIVE_TTL,
+            )
+        return _cache
@@ -0,0 +1,106 @@
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional
+import socket
+import threading
+from ..config import settings
+from ..logger import logger
+
+class DeadlineScheduler:
+    """Runs blocking calls on one shared pool and enforces a deadline per call.
+
+    A call that misses its deadline is abandoned by the caller immediately and its
+    on_timeout hook is invoked, which should close the connection the call is
+    blocked on so the worker thread unwinds instead of leaking.
+    """
+
+    def __init__(self, max_workers: int):
+        """Initializes the shared pool used for every deadline-bound call."""
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="deadline")
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._timed_out = 0
+        self._overdue_running = 0
+
+    def call(self, func: Callable[[], Any], timeout_seconds: float,
+             on_timeout: Optional[Callable[[], None]] = None) -> Any:
+        """Runs func and returns its result, or raises TimeoutError once the deadline passes."""
+        with self._lock:
+            self._in_flight += 1
+        future = self._executor.submit(func)
+        future.add_done_callback(self._on_done)
+
+        try:
+            return future.result(timeout=timeout_seconds)
+        except FutureTimeoutError:
+            with self._lock:
+                self._timed_out += 1
+            if not future.cancel():
+                # Already running: track it until the closed connection makes it unwind
+                with self._lock:
+                    self._overdue_running += 1
+                future.add_done_callback(self._on_overdue_done)
+                if on_timeout is not None:
+                    try:
+                        on_timeout()
+                    except Exception as e:
+                        logger.debug(f"on_timeout hook failed: {e}")
+            raise TimeoutError(f"Operation timed out after {timeout_seconds} seconds")
+
+    def _on_done(self, future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._completed += 1
+
+    def _on_overdue_done(self, future) -> None:
+        with self._lock:
+            self._overdue_running -= 1
+
+    def stats(self) -> Dict[str, int]:
+        """Returns counters for in-flight, timed-out and still-running overdue calls."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "timed_out": self._timed_out,
+                "overdue_running": self._overdue_running,
+            }
+
+    def shutdown(self) -> None:
+        """Stops the shared pool without waiting for overdue calls."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+_scheduler: Optional[DeadlineScheduler] = None
+_scheduler_lock = threading.Lock()
+
+def get_deadline_scheduler() -> DeadlineScheduler:
+    """Returns the process-wide deadline scheduler."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = DeadlineScheduler(max_workers=settings.DEADLINE_MAX_WORKERS)
+        return _scheduler
+
+def _refuse_reconnect(*args, **kwargs):
+    raise ConnectionAbortedError("Connection abandoned after deadline")
+
+def close_http_connections(http) -> None:
+    """Abandons an httplib2.Http's connections so blocked calls fail instead of reconnecting.
+
+    httplib2 silently reconnects and resends when a socket dies under it, so each
+    connection is evicted from the pool and its connect() is disabled before the
+    socket is shut down; the next call on this Http opens a fresh connection.
+    """
+    connections = getattr(http, 'connections', {})
+    for key, conn in list(connections.items()):
+        connections.pop(key, None)
+        conn.connect = _refuse_reconnect
+        sock = getattr(conn, 'sock', None)
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        conn.close()
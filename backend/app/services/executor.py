@@ -0,0 +1,100 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator
+import asyncio
+import contextvars
+import threading
+from ..logger import logger
+
+class ExecutorSaturatedError(Exception):
+    """Raised when the bounded executor's queue is full."""
+    pass
+
+class BoundedExecutor:
+    """Dedicated thread pool for blocking work with a bounded queue and depth metrics."""
+
+    def __init__(self, max_workers: int, max_queue: int, thread_name_prefix: str = "fetcher"):
+        """Initializes the pool; at most max_workers + max_queue jobs may be pending."""
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        """Runs a blocking callable on the pool without blocking the event loop."""
+        with self._lock:
+            if self._queued + self._running >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                logger.warning(f"Fetch executor saturated ({self._running} running, {self._queued} queued)")
+                raise ExecutorSaturatedError("Too many analyses in progress, try again later")
+            self._queued += 1
+
+        def tracked():
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+            failed = False
+            try:
+                return func(*args)
+            except Exception:
+                failed = True
+                raise
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+                    self._failed += failed
+
+        loop = asyncio.get_running_loop()
+        # Carry context variables such as the quota priority into the worker thread
+        return await loop.run_in_executor(self._executor, contextvars.copy_context().run, tracked)
+
+    async def stream(self, func: Callable[..., Iterator[Any]], *args) -> AsyncIterator[Any]:
+        """Runs a blocking generator as one pool job, yielding its items on the event loop as they arrive."""
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        finished = object()
+
+        def pump():
+            generator = func(*args)
+            try:
+                for item in generator:
+                    if stop.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, item)
+            finally:
+                generator.close()
+
+        job = asyncio.ensure_future(self.run(pump))
+        # Queued after every item the job handed over, so nothing is lost
+        job.add_done_callback(lambda _: queue.put_nowait(finished))
+        try:
+            while (item := await queue.get()) is not finished:
+                yield item
+            await job
+        finally:
+            # A consumer that stops early frees the worker at the generator's next item
+            stop.set()
+            job.cancel()
+
+    def stats(self) -> Dict[str, int]:
+        """Returns queue depth and throughput counters."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queued": self._queued,
+                "running": self._running,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self) -> None:
+        """Stops accepting work and lets running jobs finish in the background."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,98 @@
+from typing import Optional, Dict, Any
+from ..config import settings
+from .youtube_client import FetchConfig, YouTubeFetcher, load_discovery_document
+from .youtube_async_client import AsyncYouTubeFetcher, get_http_client, close_http_client, http_client_stats
+from .executor import BoundedExecutor
+from .deadlines import get_deadline_scheduler
+from .quota import get_quota_scheduler
+from .channel_cache import get_channel_id_cache
+from .resolution import get_resolution_planner
+from .response_cache import get_response_cache
+from .singleflight import get_analysis_flights
+from .result_cache import get_result_cache
+from .links import route_link
+from .retry import get_retry_engine
+from ..logger import logger
+
+_youtube_fetcher: Optional[YouTubeFetcher] = None
+_async_youtube_fetcher: Optional[AsyncYouTubeFetcher] = None
+_fetch_executor: Optional[BoundedExecutor] = None
+
+def init_fetchers() -> None:
+    """Builds the process-wide fetchers once; called from the app lifespan."""
+    global _youtube_fetcher, _async_youtube_fetcher
+
+    # Parse the discovery document up front so no request pays for it
+    load_discovery_document()
+
+    if not settings.YOUTUBE_API_KEY:
+        logger.warning("YouTube API Key is not set, fetchers will not be initialized.")
+        return
+
+    config = FetchConfig(two_pass_details=settings.YOUTUBE_TWO_PASS_DETAILS)
+    if _youtube_fetcher is None:
+        _youtube_fetcher = YouTubeFetcher(api_key=settings.YOUTUBE_API_KEY, config=config)
+    if _async_youtube_fetcher is None:
+        _async_youtube_fetcher = AsyncYouTubeFetcher(
+            api_key=settings.YOUTUBE_API_KEY, config=config, client=get_http_client()
+        )
+    logger.info("YouTube fetchers initialized.")
+
+def get_youtube_fetcher() -> YouTubeFetcher:
+    """Returns the shared blocking fetcher, building it on first use outside the lifespan."""
+    if _youtube_fetcher is None:
+        init_fetchers()
+    return _youtube_fetcher
+
+def get_async_youtube_fetcher() -> AsyncYouTubeFetcher:
+    """Returns the shared asyncio fetcher, building it on first use outside the lifespan."""
+    if _async_youtube_fetcher is None:
+        init_fetchers()
+    return _async_youtube_fetcher
+
+def get_fetch_executor() -> BoundedExecutor:
+    """Returns the bounded thread pool that runs the blocking fetcher."""
+    global _fetch_executor
+    if _fetch_executor is None:
+        _fetch_executor = BoundedExecutor(
+            max_workers=settings.FETCH_EXECUTOR_MAX_WORKERS,
+            max_queue=settings.FETCH_EXECUTOR_MAX_QUEUE,
+        )
+    return _fetch_executor
+
+def collect_stats() -> Dict[str, Any]:
+    """Gathers runtime counters from the shared fetch components."""
+    stats = {
+        "fetcher_mode": settings.YOUTUBE_FETCHER_MODE,
+        "quota": get_quota_scheduler().stats(),
+        "single_flight": get_analysis_flights().stats(),
+        "retries": get_retry_engine().stats(),
+        "link_router": route_link.cache_info()._asdict(),
+    }
+    if _async_youtube_fetcher is not None:
+        stats["http_client"] = http_client_stats()
+        stats["async_id_batches"] = _async_youtube_fetcher.id_batcher.stats.snapshot()
+    if _youtube_fetcher is not None or _async_youtube_fetcher is not None:
+        stats["channel_id_cache"] = get_channel_id_cache().stats()
+        stats["resolution"] = get_resolution_planner().stats()
+        stats["response_cache"] = get_response_cache().stats()
+        stats["result_cache"] = get_result_cache().stats()
+    if _fetch_executor is not None:
+        stats["fetch_executor"] = _fetch_executor.stats()
+    if _youtube_fetcher is not None:
+        stats["deadlines"] = get_deadline_scheduler().stats()
+        stats["transports"] = _youtube_fetcher.transports.stats()
+        stats["id_batches"] = _youtube_fetcher.id_batcher.stats.snapshot()
+    return stats
+
+async def close_fetchers() -> None:
+    """Releases the shared fetchers, the fetch executor and connection pools."""
+    global _youtube_fetcher, _async_youtube_fetcher, _fetch_executor
+    if _youtube_fetcher is not None:
+        _youtube_fetcher.close()
+    _youtube_fetcher = None
+    _async_youtube_fetcher = None
+    if _fetch_executor is not None:
+        _fetch_executor.shutdown()
+        _fetch_executor = None
+    await close_http_client()
@@ -0,0 +1,155 @@
+from collections import OrderedDict
+from datetime import datetime
+from statistics import median
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl
+import json
+import threading
+import time
+from ..config import settings
+
+# Cached response kinds, by Data API resource
+RESOURCE_KINDS = {
+    'channels': 'channel',
+    'playlistItems': 'uploads_page',
+    'videos': 'video_stats',
+    'commentThreads': 'comment_page',
+}
+
+# Activity this long ago leaves a kind's base TTL unscaled
+ACTIVITY_REFERENCE_AGE = 24 * 3600
+
+def parse_timestamp(value: Optional[str]) -> Optional[float]:
+    """Parses an RFC 3339 publishedAt value to a Unix timestamp."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
+
+def channel_for_uploads(playlist_id: str) -> Optional[str]:
+    """Returns the channel owning an uploads playlist: UU... belongs to UC..."""
+    return 'UC' + playlist_id[2:] if playlist_id.startswith('UU') else None
+
+class FreshnessPolicy:
+    """Decides how long a cached response may be served without asking the API again.
+
+    Each resource kind has a base TTL. It is scaled by how recently the thing it
+    describes changed: the channel's last upload and typical gap between uploads
+    for channels and upload pages, the video's age for statistics and comments.
+    Uploads and videos seen in responses feed a bounded per-channel and
+    per-video activity record, so a daily uploader's data expires in minutes
+    while a dormant channel's lasts days.
+    """
+
+    def __init__(self, base_ttls: Dict[str, float], min_scale: float, max_scale: float, max_tracked: int = 10000):
+        self.base_ttls = base_ttls
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.max_tracked = max_tracked
+        self._lock = threading.Lock()
+        # channel ID -> (last upload, median gap between uploads or None)
+        self._channels: "OrderedDict[str, Tuple[float, Optional[float]]]" = OrderedDict()
+        # video ID -> publishedAt
+        self._videos: "OrderedDict[str, float]" = OrderedDict()
+
+    def _track(self, table: OrderedDict, key: str, value: Any) -> None:
+        table[key] = value
+        table.move_to_end(key)
+        while len(table) > self.max_tracked:
+            table.popitem(last=False)
+
+    def _record_uploads(self, channel_id: str, published: List[float], first_page: bool) -> None:
+        published = sorted(published, reverse=True)
+        gaps = [newer - older for newer, older in zip(published, published[1:])]
+        with self._lock:
+            last_upload, gap = self._channels.get(channel_id, (0.0, None))
+            # The first page holds the latest uploads, so it sets the current cadence
+            if gaps and (first_page or gap is None):
+                gap = median(gaps)
+            self._track(self._channels, channel_id, (max(last_upload, published[0]), gap))
+
+    def _record_videos(self, items: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            for item in items:
+                snippet = item.get('snippet', {})
+                published = parse_timestamp(snippet.get('publishedAt'))
+                if published is None or 'id' not in item:
+                    continue
+                self._track(self._videos, item['id'], published)
+                channel_id = snippet.get('channelId')
+                if channel_id:
+                    last_upload, gap = self._channels.get(channel_id, (0.0, None))
+                    self._track(self._channels, channel_id, (max(last_upload, published), gap))
+
+    def _channel_age(self, channel_id: Optional[str], now: float) -> Optional[float]:
+        with self._lock:
+            activity = self._channels.get(channel_id) if channel_id else None
+        if activity is None:
+            return None
+        last_upload, gap = activity
+        age = now - last_upload
+        return min(age, gap) if gap else age
+
+    def _scale(self, age: Optional[float]) -> float:
+        if age is None:
+            return 1.0
+        return min(max(age / ACTIVITY_REFERENCE_AGE, self.min_scale), self.max_scale)
+
+    def ttl_for(self, key: str, body: bytes) -> float:
+        """Returns the freshness TTL for a response stored under a ResponseCache key."""
+        resource, _, query = key.partition('?')
+        kind = RESOURCE_KINDS.get(resource)
+        if kind is None:
+            return 0.0
+        params = dict(parse_qsl(query))
+        try:
+            items = json.loads(body).get('items', [])
+        except (ValueError, AttributeError):
+            items = []
+        now = time.time()
+
+        if kind == 'uploads_page':
+            channel_id = channel_for_uploads(params.get('playlistId', ''))
+            published = [
+                timestamp for item in items
+                if (timestamp := parse_timestamp(item.get('contentDetails', {}).get('videoPublishedAt'))) is not None
+            ]
+            if channel_id and published:
+                self._record_uploads(channel_id, published, first_page='pageToken' not in params)
+            age = self._channel_age(channel_id, now)
+        elif kind == 'channel':
+            ages = [age for item in items if (age := self._channel_age(item.get('id'), now)) is not None]
+            age = min(ages) if ages else None
+        elif kind == 'video_stats':
+            self._record_videos(items)
+            ages = [
+                now - published for item in items
+                if (published := parse_timestamp(item.get('snippet', {}).get('publishedAt'))) is not None
+            ]
+            # One combined call covers many videos; the youngest decides
+            age = min(ages) if ages else None
+        else:
+            with self._lock:
+                published = self._videos.get(params.get('videoId'))
+            age = now - published if published is not None else None
+
+        return self.base_ttls[kind] * self._scale(age)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"tracked_channels": len(self._channels), "tracked_videos": len(self._videos)}
+
+def build_freshness_policy() -> FreshnessPolicy:
+    """Builds the policy from the RESPONSE_TTL_* settings."""
+    return FreshnessPolicy(
+        base_ttls={
+            'channel': settings.RESPONSE_TTL_CHANNEL,
+            'uploads_page': settings.RESPONSE_TTL_UPLOADS_PAGE,
+            'video_stats': settings.RESPONSE_TTL_VIDEO_STATS,
+            'comment_page': settings.RESPONSE_TTL_COMMENT_PAGE,
+        },
+        min_scale=settings.RESPONSE_TTL_MIN_SCALE,
+        max_scale=settings.RESPONSE_TTL_MAX_SCALE,
+    )
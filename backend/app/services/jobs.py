@@ -0,0 +1,319 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from ..config import settings
+from .analyzer import stream_link
+from .quota import BATCH, quota_priority
+from .youtube_client import assemble_channel_data, assemble_video_data
+from ..logger import logger
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+def assemble_sections(sections: List[Dict[str, Any]]) -> Any:
+    """Builds the /analyze result from the sections stream_link yielded."""
+    first = sections[0]["event"] if sections else None
+    if first == "result":
+        return sections[0]["data"]
+    if first == "video":
+        return assemble_video_data(sections)
+    return assemble_channel_data(sections)
+
+class JobStore:
+    """SQLite (WAL) journal of analysis jobs and the sections each has produced so far.
+
+    Several processes may share one journal. A job is claimed before it runs,
+    which records this store's owner ID and a lease the runner keeps renewing;
+    only jobs whose lease has lapsed are recovered, and writes from a runner
+    that lost its lease are dropped.
+    """
+
+    def __init__(self, path: str, lease_ttl: float = 60.0):
+        """Opens (creating if needed) the journal at path."""
+        self.lease_ttl = lease_ttl
+        self.owner = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY, link TEXT NOT NULL, field_masks TEXT, status TEXT NOT NULL,"
+            " result TEXT, error TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL,"
+            " owner TEXT, lease_expires_at REAL)"
+        )
+        # Journals written before leases existed lack the lease columns
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(jobs)")}
+        for column, kind in (("owner", "TEXT"), ("lease_expires_at", "REAL")):
+            if column not in columns:
+                self._db.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS job_sections ("
+            " job_id TEXT NOT NULL, seq INTEGER NOT NULL, event TEXT NOT NULL, data TEXT NOT NULL,"
+            " PRIMARY KEY (job_id, seq))"
+        )
+
+    def create(self, link: str, field_masks: Optional[Dict[str, Optional[str]]]) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (id, link, field_masks, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, link, json.dumps(field_masks), QUEUED, now, now),
+            )
+        return job_id
+
+    def claim(self, job_id: str) -> bool:
+        """Marks a queued job running under this store's lease; False if another process got it first."""
+        now = time.time()
+        with self._lock:
+            return bool(self._db.execute(
+                "UPDATE jobs SET status = ?, owner = ?, lease_expires_at = ?, updated_at = ?"
+                " WHERE id = ? AND status = ?",
+                (RUNNING, self.owner, now + self.lease_ttl, now, job_id, QUEUED),
+            ).rowcount)
+
+    def finish(self, job_id: str, status: str, result: Any = None, error: Optional[str] = None) -> bool:
+        """Records a claimed job's outcome; False if its lease was lost and the write was dropped."""
+        with self._lock:
+            return bool(self._db.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ?, lease_expires_at = NULL"
+                " WHERE id = ? AND owner = ? AND status = ?",
+                (status, json.dumps(result) if result is not None else None, error, time.time(),
+                 job_id, self.owner, RUNNING),
+            ).rowcount)
+
+    def add_section(self, job_id: str, seq: int, section: Dict[str, Any]) -> bool:
+        """Journals a section of a claimed job; False if its lease was lost and the write was dropped."""
+        with self._lock:
+            owned = self._db.execute(
+                "UPDATE jobs SET updated_at = ? WHERE id = ? AND owner = ? AND status = ?",
+                (time.time(), job_id, self.owner, RUNNING),
+            ).rowcount
+            if owned:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO job_sections (job_id, seq, event, data) VALUES (?, ?, ?, ?)",
+                    (job_id, seq, section["event"], json.dumps(section["data"])),
+                )
+        return bool(owned)
+
+    def renew_leases(self) -> int:
+        """Extends the lease of every job this store is running; returns how many."""
+        with self._lock:
+            return self._db.execute(
+                "UPDATE jobs SET lease_expires_at = ? WHERE owner = ? AND status = ?",
+                (time.time() + self.lease_ttl, self.owner, RUNNING),
+            ).rowcount
+
+    def sections(self, job_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT event, data FROM job_sections WHERE job_id = ? ORDER BY seq", (job_id,)
+            ).fetchall()
+        return [{"event": event, "data": json.loads(data)} for event, data in rows]
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Returns the job's status with its final result, or the sections produced so far."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, link, status, result, error, created_at, updated_at FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = {
+            "job_id": row[0], "link": row[1], "status": row[2],
+            "created_at": row[5], "updated_at": row[6],
+        }
+        if row[2] == DONE:
+            job["result"] = json.loads(row[3])
+        else:
+            job["partial"] = self.sections(job_id)
+        if row[4]:
+            job["error"] = row[4]
+        return job
+
+    def release_leases(self) -> int:
+        """Expires the leases of jobs this store was running, so the next start reruns them at once."""
+        with self._lock:
+            return self._db.execute(
+                "UPDATE jobs SET lease_expires_at = 0 WHERE owner = ? AND status = ?", (self.owner, RUNNING)
+            ).rowcount
+
+    def _requeue_expired(self) -> List[tuple]:
+        # Runs inside the caller's transaction, so two processes cannot both requeue a job
+        expired = "status = ? AND (lease_expires_at IS NULL OR lease_expires_at < ?)"
+        params = (RUNNING, time.time())
+        rows = self._db.execute(
+            f"SELECT id, link, field_masks FROM jobs WHERE {expired} ORDER BY created_at", params
+        ).fetchall()
+        self._db.execute(f"DELETE FROM job_sections WHERE job_id IN (SELECT id FROM jobs WHERE {expired})", params)
+        self._db.execute(f"UPDATE jobs SET status = ?, owner = NULL, lease_expires_at = NULL WHERE {expired}",
+                         (QUEUED, *params))
+        return rows
+
+    def requeue_expired(self) -> List[tuple]:
+        """Requeues running jobs whose lease lapsed; returns them as (id, link, field_masks)."""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._requeue_expired()
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+        return [(job_id, link, json.loads(field_masks)) for job_id, link, field_masks in rows]
+
+    def recover(self) -> List[tuple]:
+        """Requeues jobs whose lease lapsed; returns every queued (id, link, field_masks)."""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._requeue_expired()
+                rows = self._db.execute(
+                    "SELECT id, link, field_masks FROM jobs WHERE status = ? ORDER BY created_at", (QUEUED,)
+                ).fetchall()
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+        return [(job_id, link, json.loads(field_masks)) for job_id, link, field_masks in rows]
+
+    def prune(self, max_age: float) -> int:
+        """Deletes finished jobs last updated more than max_age seconds ago."""
+        cutoff = time.time() - max_age
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM job_sections WHERE job_id IN"
+                " (SELECT id FROM jobs WHERE status IN (?, ?) AND updated_at < ?)",
+                (DONE, FAILED, cutoff),
+            )
+            return self._db.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?", (DONE, FAILED, cutoff)
+            ).rowcount
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+class JobRunner:
+    """In-process worker pool that runs journaled analysis jobs in the background.
+
+    Jobs are written to the journal before they are queued, and every section
+    is recorded as it streams in, so GET /jobs/{id} can show partial results.
+    Workers make their API calls at batch quota priority, behind interactive
+    /analyze traffic. Journal writes serialize whole sections, so they run off
+    the event loop. A heartbeat keeps the leases of running jobs alive and
+    requeues jobs whose process died; those are rerun from scratch.
+    """
+
+    def __init__(self, store: JobStore, workers: int, heartbeat_interval: float = 15.0):
+        self.store = store
+        self.workers = workers
+        self.heartbeat_interval = heartbeat_interval
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        """Requeues unfinished jobs and starts the workers on the running loop."""
+        pruned = self.store.prune(settings.JOB_RETENTION)
+        if pruned:
+            logger.info(f"Pruned {pruned} finished jobs")
+        self._queue = asyncio.Queue()
+        for job_id, link, field_masks in self.store.recover():
+            self._queue.put_nowait((job_id, link, field_masks))
+        if self._queue.qsize():
+            logger.info(f"Resuming {self._queue.qsize()} queued jobs")
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._heartbeat()))
+
+    async def stop(self) -> None:
+        """Stops the workers; jobs they were running stay journaled and rerun on the next start."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await asyncio.to_thread(self.store.release_leases)
+
+    async def submit(self, link: str, field_masks: Optional[Dict[str, Optional[str]]] = None) -> str:
+        """Journals a new job and queues it; returns its ID."""
+        job_id = await asyncio.to_thread(self.store.create, link, field_masks)
+        self._queue.put_nowait((job_id, link, field_masks))
+        logger.info(f"Queued job {job_id} for link: {link}")
+        return job_id
+
+    async def _work(self) -> None:
+        # Everything this worker fetches yields to interactive requests
+        quota_priority.set(BATCH)
+        while True:
+            job_id, link, field_masks = await self._queue.get()
+            try:
+                await self._run(job_id, link, field_masks)
+            finally:
+                self._queue.task_done()
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await asyncio.to_thread(self.store.renew_leases)
+                for job in await asyncio.to_thread(self.store.requeue_expired):
+                    logger.info(f"Requeuing job {job[0]} whose lease lapsed")
+                    self._queue.put_nowait(job)
+            except sqlite3.Error as e:
+                logger.warning(f"Job lease heartbeat failed: {e}")
+
+    async def _run(self, job_id: str, link: str, field_masks: Optional[Dict[str, Optional[str]]]) -> None:
+        if not await asyncio.to_thread(self.store.claim, job_id):
+            # Another process sharing the journal is running or has run it
+            return
+        sections = []
+        try:
+            async for section in stream_link(link, field_masks):
+                if not await asyncio.to_thread(self.store.add_section, job_id, len(sections), section):
+                    logger.warning(f"Job {job_id} lost its lease, leaving it to the process that took over")
+                    return
+                sections.append(section)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Job {job_id} for {link} failed: {e}")
+            await asyncio.to_thread(self.store.finish, job_id, FAILED, error=str(e))
+            return
+        if await asyncio.to_thread(self.store.finish, job_id, DONE, result=assemble_sections(sections)):
+            logger.info(f"Job {job_id} for {link} finished")
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the worker count, the in-memory queue depth and journaled jobs per status."""
+        return {
+            "workers": self.workers,
+            "queued_in_memory": self._queue.qsize() if self._queue is not None else 0,
+            "jobs": self.store.counts(),
+        }
+
+_runner: Optional[JobRunner] = None
+_runner_lock = threading.Lock()
+
+def get_job_runner() -> JobRunner:
+    """Returns the process-wide job runner."""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = JobRunner(
+                store=JobStore(settings.JOBS_DB_PATH, lease_ttl=settings.JOB_LEASE_TTL),
+                workers=settings.JOB_WORKERS,
+                heartbeat_interval=settings.JOB_HEARTBEAT_INTERVAL,
+            )
+        return _runner
@@ -0,0 +1,94 @@
+from functools import lru_cache
+from typing import NamedTuple, Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+import re
+
+# Platforms
+YOUTUBE = "youtube"
+FACEBOOK = "facebook"
+INSTAGRAM = "instagram"
+UNKNOWN = "unknown"
+INVALID = "invalid"
+
+# YouTube link kinds; CUSTOM_URL and USER double as channel ID cache key kinds
+VIDEO = "video"
+CHANNEL = "channel"
+HANDLE = "handle"
+CUSTOM_URL = "c"
+USER = "user"
+
+# Distinct links routed; dashboards resend the same few hundred links all day
+ROUTE_CACHE_SIZE = 4096
+
+_YOUTUBE_HOST = re.compile(r'^(?:(?:www|m|music)\.)?youtube\.com$')
+_SHORT_HOST = re.compile(r'^(?:www\.)?youtu\.be$')
+_FACEBOOK_HOST = re.compile(r'(?:^|\.)facebook\.com$')
+_INSTAGRAM_HOST = re.compile(r'(?:^|\.)instagram\.com$')
+_WATCH_PATH = re.compile(r'^/watch/?$')
+_SHORT_PATH = re.compile(r'^/([\w-]+)')
+# Matched against the path in order; the first segment after the prefix is the value
+_YOUTUBE_PATHS = [
+    (re.compile(r'^/(?:shorts|live|embed|v)/([\w-]+)'), VIDEO),
+    (re.compile(r'^/channel/([\w-]+)'), CHANNEL),
+    (re.compile(r'^/@([^/]+)'), HANDLE),
+    (re.compile(r'^/c/([^/]+)'), CUSTOM_URL),
+    (re.compile(r'^/user/([^/]+)'), USER),
+]
+
+class LinkTarget(NamedTuple):
+    """What a link points at: a platform, a kind of target and its ID, handle or name."""
+    platform: str
+    kind: Optional[str] = None
+    value: Optional[str] = None
+
+    @property
+    def canonical(self) -> Optional[str]:
+        """One string per YouTube target however it was linked, or None for other links."""
+        if self.platform != YOUTUBE or self.kind is None:
+            return None
+        if self.kind == VIDEO:
+            return f"youtube.com/watch?v={self.value}"
+        if self.kind == CHANNEL:
+            return f"youtube.com/channel/{self.value}"
+        # Handles and custom URLs are case-insensitive; video and channel IDs are not
+        if self.kind == HANDLE:
+            return f"youtube.com/@{self.value.lower()}"
+        return f"youtube.com/{self.kind}/{self.value.lower()}"
+
+def _route_youtube(path: str, query: str) -> LinkTarget:
+    if _WATCH_PATH.match(path):
+        video_id = parse_qs(query).get('v', [None])[0]
+        return LinkTarget(YOUTUBE, VIDEO, video_id) if video_id else LinkTarget(YOUTUBE)
+    for pattern, kind in _YOUTUBE_PATHS:
+        match = pattern.match(path)
+        if match:
+            return LinkTarget(YOUTUBE, kind, unquote(match.group(1)))
+    return LinkTarget(YOUTUBE)
+
+@lru_cache(maxsize=ROUTE_CACHE_SIZE)
+def route_link(link: str) -> LinkTarget:
+    """Routes a link to its target, e.g. LinkTarget('youtube', 'video', 'dQw4w9WgXcQ').
+
+    Covers youtube.com with or without www, m. and music., youtu.be, and the
+    /watch, /shorts/, /live/, /embed/, /channel/, /@, /c/ and /user/ forms. A
+    YouTube link with no recognizable target has kind None; a link without a
+    host routes to INVALID.
+    """
+    try:
+        parts = urlsplit(link.strip())
+        hostname = parts.hostname
+    except ValueError:
+        return LinkTarget(INVALID)
+    if not hostname:
+        return LinkTarget(INVALID)
+
+    if _YOUTUBE_HOST.match(hostname):
+        return _route_youtube(parts.path, parts.query)
+    if _SHORT_HOST.match(hostname):
+        match = _SHORT_PATH.match(parts.path)
+        return LinkTarget(YOUTUBE, VIDEO, match.group(1)) if match else LinkTarget(YOUTUBE)
+    if _FACEBOOK_HOST.search(hostname):
+        return LinkTarget(FACEBOOK)
+    if _INSTAGRAM_HOST.search(hostname):
+        return LinkTarget(INSTAGRAM)
+    return LinkTarget(UNKNOWN)
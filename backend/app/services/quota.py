@@ -0,0 +1,256 @@
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional
+from zoneinfo import ZoneInfo
+import asyncio
+import sqlite3
+import threading
+import time
+from ..config import settings
+from ..logger import logger
+
+# Data API v3 quota cost per call, in units
+QUOTA_COSTS = {
+    'search': 100,
+    'channels': 1,
+    'videos': 1,
+    'playlistItems': 1,
+    'commentThreads': 1,
+}
+DEFAULT_QUOTA_COST = 1
+
+# The daily quota resets at midnight Pacific time
+QUOTA_RESET_TZ = ZoneInfo("America/Los_Angeles")
+
+INTERACTIVE = 0
+BATCH = 1
+
+# Priority of the API calls made in the current context; background work sets BATCH
+quota_priority: ContextVar[int] = ContextVar("quota_priority", default=INTERACTIVE)
+
+class QuotaExceededError(Exception):
+    """Raised when a call is refused to keep the deployment inside its Data API quota."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+def quota_cost(resource: str) -> int:
+    """Returns the quota units a list call on the resource costs."""
+    return QUOTA_COSTS.get(resource, DEFAULT_QUOTA_COST)
+
+class QuotaScheduler:
+    """Charges every Data API call against a daily budget and a token-bucket rate.
+
+    Calls that would overdraw the daily budget are refused outright. Calls that
+    only exceed the current burst allowance are deferred until the bucket
+    refills, with interactive callers served ahead of batch work; batch work
+    also cannot eat into the share of the budget reserved for interactive use.
+
+    Daily usage is kept in SQLite per Pacific-time quota day and charged with a
+    conditional update, so it survives restarts and every process sharing the
+    file draws on one budget. The token bucket stays per process.
+    """
+
+    def __init__(self, daily_budget: int, refill_per_second: float, burst: int,
+                 interactive_reserve: float, max_wait: float, path: str = ":memory:"):
+        """Initializes a full bucket and loads today's usage from the SQLite store at path."""
+        self.daily_budget = daily_budget
+        self.refill_per_second = refill_per_second
+        self.burst = burst
+        self.interactive_reserve = interactive_reserve
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._interactive_waiting = 0
+        self._units_by_resource: Dict[str, int] = {}
+        self._deferred = 0
+        self._refused = 0
+
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS quota_usage (day TEXT PRIMARY KEY, used INTEGER NOT NULL)")
+        self._start_day()
+
+    @staticmethod
+    def _next_reset() -> datetime:
+        now = datetime.now(QUOTA_RESET_TZ)
+        return (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    @staticmethod
+    def _quota_day() -> str:
+        return datetime.now(QUOTA_RESET_TZ).date().isoformat()
+
+    def _start_day(self) -> None:
+        """Switches to the current quota day, picking up what other processes already used of it."""
+        self._day = self._quota_day()
+        self._reset_at = self._next_reset()
+        # Units used today as last read from the store; other processes only ever add to them
+        self._used = 0
+        try:
+            self._db.execute("INSERT OR IGNORE INTO quota_usage (day, used) VALUES (?, 0)", (self._day,))
+            self._db.execute("DELETE FROM quota_usage WHERE day < ?", (self._day,))
+            self._load_used()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to load quota usage for {self._day}: {e}")
+
+    def _load_used(self) -> None:
+        row = self._db.execute("SELECT used FROM quota_usage WHERE day = ?", (self._day,)).fetchone()
+        self._used = max(self._used, row[0] if row else 0)
+
+    def _charge(self, cost: int, budget: int) -> bool:
+        """Adds cost to today's usage unless that would exceed budget, atomically across processes."""
+        try:
+            charged = self._db.execute(
+                "UPDATE quota_usage SET used = used + ? WHERE day = ? AND used + ? <= ?",
+                (cost, self._day, cost, budget),
+            ).rowcount
+            self._load_used()
+            return bool(charged)
+        except sqlite3.Error as e:
+            # Keep serving on the in-process count rather than failing every call
+            logger.warning(f"Failed to record quota usage: {e}")
+            if self._used + cost > budget:
+                return False
+            self._used += cost
+            return True
+
+    def _seconds_until_reset(self) -> float:
+        return max((self._reset_at - datetime.now(QUOTA_RESET_TZ)).total_seconds(), 0.0)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.refill_per_second)
+        self._last_refill = now
+        if datetime.now(QUOTA_RESET_TZ) >= self._reset_at:
+            self._start_day()
+
+    def _try_acquire(self, resource: str, priority: int) -> float:
+        """Charges the call if possible and returns 0, otherwise the seconds to wait."""
+        cost = quota_cost(resource)
+        with self._lock:
+            self._refill()
+
+            budget = self.daily_budget
+            if priority != INTERACTIVE:
+                budget -= int(self.daily_budget * self.interactive_reserve)
+            if self._used + cost > budget:
+                self._refuse()
+
+            # Batch work yields the bucket to interactive callers that are waiting
+            if self._tokens >= cost and (priority == INTERACTIVE or not self._interactive_waiting):
+                # Another process may have spent the rest of the budget since _used was read
+                if not self._charge(cost, budget):
+                    self._refuse()
+                self._tokens -= cost
+                self._units_by_resource[resource] = self._units_by_resource.get(resource, 0) + cost
+                return 0.0
+            return max((cost - self._tokens) / self.refill_per_second, 0.05)
+
+    def _refuse(self) -> None:
+        self._refused += 1
+        raise QuotaExceededError(
+            f"Daily YouTube API quota exhausted ({self._used}/{self.daily_budget} units used)",
+            retry_after=self._seconds_until_reset(),
+        )
+
+    def _begin_wait(self, priority: int, waited: float, wait: float) -> None:
+        if waited + wait > self.max_wait:
+            with self._lock:
+                self._refused += 1
+            raise QuotaExceededError("YouTube API rate budget saturated, try again later", retry_after=wait)
+        with self._lock:
+            if not waited:
+                self._deferred += 1
+            if priority == INTERACTIVE:
+                self._interactive_waiting += 1
+
+    def _end_wait(self, priority: int) -> None:
+        if priority == INTERACTIVE:
+            with self._lock:
+                self._interactive_waiting -= 1
+
+    async def acquire(self, resource: str, priority: Optional[int] = None) -> None:
+        """Waits until the call may proceed, or raises QuotaExceededError."""
+        if priority is None:
+            priority = quota_priority.get()
+        waited = 0.0
+        while True:
+            wait = self._try_acquire(resource, priority)
+            if not wait:
+                return
+            self._begin_wait(priority, waited, wait)
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                self._end_wait(priority)
+            waited += wait
+
+    def acquire_blocking(self, resource: str, priority: Optional[int] = None) -> None:
+        """Blocking variant of acquire for the threaded fetcher."""
+        if priority is None:
+            priority = quota_priority.get()
+        waited = 0.0
+        while True:
+            wait = self._try_acquire(resource, priority)
+            if not wait:
+                return
+            self._begin_wait(priority, waited, wait)
+            try:
+                time.sleep(wait)
+            finally:
+                self._end_wait(priority)
+            waited += wait
+
+    def mark_exhausted(self) -> None:
+        """Records that Google reported quotaExceeded; refuse everything until the reset."""
+        with self._lock:
+            self._used = max(self._used, self.daily_budget)
+            try:
+                self._db.execute(
+                    "UPDATE quota_usage SET used = MAX(used, ?) WHERE day = ?", (self.daily_budget, self._day)
+                )
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to record quota exhaustion: {e}")
+        logger.error("YouTube API reported quotaExceeded, refusing calls until the daily reset")
+
+    def stats(self) -> Dict[str, object]:
+        """Returns budget usage, bucket level and refusal counters."""
+        with self._lock:
+            self._refill()
+            try:
+                self._load_used()
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to read quota usage: {e}")
+            return {
+                "daily_budget": self.daily_budget,
+                "used_today": self._used,
+                "remaining_today": max(self.daily_budget - self._used, 0),
+                "seconds_until_reset": int(self._seconds_until_reset()),
+                "tokens": int(self._tokens),
+                "units_by_resource": dict(self._units_by_resource),
+                "deferred": self._deferred,
+                "refused": self._refused,
+            }
+
+_scheduler: Optional[QuotaScheduler] = None
+_scheduler_lock = threading.Lock()
+
+def get_quota_scheduler() -> QuotaScheduler:
+    """Returns the process-wide quota scheduler shared by every fetcher."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = QuotaScheduler(
+                daily_budget=settings.YOUTUBE_DAILY_QUOTA,
+                refill_per_second=settings.YOUTUBE_QUOTA_REFILL_PER_SECOND,
+                burst=settings.YOUTUBE_QUOTA_BURST,
+                interactive_reserve=settings.YOUTUBE_QUOTA_INTERACTIVE_RESERVE,
+                max_wait=settings.YOUTUBE_QUOTA_MAX_WAIT,
+                path=settings.YOUTUBE_QUOTA_USAGE_PATH,
+            )
+        return _scheduler
@@ -0,0 +1,70 @@
+from typing import Dict, List, Optional
+import threading
+from ..config import settings
+
+# 1-unit channels.list lookups, run together on every resolution; earlier ones take precedence
+CHEAP_STRATEGIES = ['for_handle', 'for_username']
+# 100-unit search.list fallbacks, run one at a time within the search budget
+SEARCH_STRATEGIES = ['basic_search', 'quoted_search', 'variant_search']
+
+class ResolutionFailed(Exception):
+    """Raised when a resolution strategy hit an error instead of a clean "not found".
+
+    The channel ID cache only records a handle as unresolvable when every
+    strategy got an empty answer, never because the API was failing.
+    """
+    pass
+
+class ResolutionPlanner:
+    """Records which channel resolution strategy wins and orders the search fallbacks.
+
+    Cheap lookups always run first, and a forHandle hit beats a forUsername one. The expensive search strategies are tried in
+    order of observed win rate (Laplace-smoothed, so untried strategies keep
+    their default position) and only while the per-resolution search budget
+    lasts.
+    """
+
+    def __init__(self, search_budget: int):
+        """Initializes empty win/attempt counters for every strategy."""
+        self.search_budget = search_budget
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = {
+            name: {"attempts": 0, "wins": 0} for name in CHEAP_STRATEGIES + SEARCH_STRATEGIES
+        }
+
+    def record(self, strategy: str, won: bool) -> None:
+        """Records one attempt of a strategy and whether it resolved the channel."""
+        with self._lock:
+            counts = self._counts.setdefault(strategy, {"attempts": 0, "wins": 0})
+            counts["attempts"] += 1
+            counts["wins"] += int(won)
+
+    def _win_rate(self, strategy: str) -> float:
+        counts = self._counts.get(strategy, {"attempts": 0, "wins": 0})
+        return (counts["wins"] + 1) / (counts["attempts"] + 2)
+
+    def search_order(self) -> List[str]:
+        """Returns the search fallbacks, most successful first."""
+        with self._lock:
+            return sorted(SEARCH_STRATEGIES, key=self._win_rate, reverse=True)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Returns attempt and win counters per strategy."""
+        with self._lock:
+            return {name: dict(counts) for name, counts in self._counts.items()}
+
+def handle_search_variant(handle: str) -> Optional[str]:
+    """Returns the handle with '_' and '-' turned into spaces, if that changes it."""
+    variant = handle.replace('_', ' ').replace('-', ' ')
+    return variant if variant != handle else None
+
+_planner: Optional[ResolutionPlanner] = None
+_planner_lock = threading.Lock()
+
+def get_resolution_planner() -> ResolutionPlanner:
+    """Returns the process-wide resolution planner shared by both fetchers."""
+    global _planner
+    with _planner_lock:
+        if _planner is None:
+            _planner = ResolutionPlanner(search_budget=settings.HANDLE_SEARCH_BUDGET)
+        return _planner
@@ -0,0 +1,271 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+import json
+import sqlite3
+import threading
+import time
+from .freshness import FreshnessPolicy, build_freshness_policy
+from ..config import settings
+from ..logger import logger
+
+# Data API resources whose responses carry ETags worth revalidating
+CACHEABLE_RESOURCES = {'channels', 'videos', 'playlistItems', 'commentThreads'}
+# Query parameters that do not change the response body
+IGNORED_PARAMS = {'key', 'alt'}
+# Rows past max_age are deleted on write at most this often
+PRUNE_INTERVAL = 3600
+
+class ResponseCache:
+    """ETag-validated cache of Data API response bodies: an in-memory LRU over SQLite.
+
+    Each stored body stays fresh for a TTL set by the freshness policy per
+    resource kind and channel activity; fetchers serve fresh bodies without
+    calling the API at all. After that its ETag is sent as If-None-Match. A 304
+    reply means the stored body is current, and it is served without
+    transferring the payload again. Rows that have not been revalidated for
+    max_age are dropped on open and, at most every PRUNE_INTERVAL, on write.
+
+    Combined videos/channels calls mix IDs from concurrent requests, so their
+    URLs rarely repeat. They are not cached whole; fetchers store each item
+    under the key a lookup of that ID alone would use, and check those items'
+    freshness before batching. Such entries have no ETag of their own (the API
+    only issues one per response), so once stale the ID is simply fetched again.
+    """
+
+    def __init__(self, path: str, max_entries: int, max_age: float, policy: Optional[FreshnessPolicy] = None):
+        """Opens (creating if needed) the SQLite store at path and prunes expired rows."""
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.policy = policy
+        # key -> (etag, body, content type, fresh until)
+        self._memory: "OrderedDict[str, Tuple[str, bytes, str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "requests": 0, "memory_hits": 0, "disk_hits": 0, "misses": 0,
+            "revalidated": 0, "changed": 0, "stored": 0, "bytes_saved": 0, "fresh_hits": 0,
+        }
+        self._fresh_hits_by_resource: Dict[str, int] = {}
+
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, etag TEXT NOT NULL, body BLOB NOT NULL,"
+            " content_type TEXT NOT NULL, validated_at REAL NOT NULL)"
+        )
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(responses)")}
+        if 'fresh_until' not in columns:
+            self._db.execute("ALTER TABLE responses ADD COLUMN fresh_until REAL NOT NULL DEFAULT 0")
+        self._pruned_at = 0.0
+        self._prune(time.time())
+
+    def _prune(self, now: float) -> None:
+        # Caller holds the lock (or is the constructor)
+        self._pruned_at = now
+        try:
+            pruned = self._db.execute("DELETE FROM responses WHERE validated_at < ?", (now - self.max_age,)).rowcount
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to prune cached responses: {e}")
+            return
+        if pruned:
+            logger.info(f"Pruned {pruned} cached responses not revalidated for {self.max_age} seconds")
+
+    @staticmethod
+    def key_for(url: str) -> Optional[str]:
+        """Returns the cache key for a Data API GET URL, or None if it is not cacheable."""
+        parts = urlsplit(url)
+        resource = parts.path.rstrip('/').rsplit('/', 1)[-1]
+        if resource not in CACHEABLE_RESOURCES:
+            return None
+        params = [(name, value) for name, value in parse_qsl(parts.query) if name not in IGNORED_PARAMS]
+        # Combined lookups are cached per item instead; see store_items
+        if any(name == 'id' and ',' in value for name, value in params):
+            return None
+        return f"{resource}?{urlencode(sorted(params))}"
+
+    @staticmethod
+    def item_key(resource: str, item_id: str, params: Dict[str, Any]) -> str:
+        """Returns the key of one videos/channels item: the key_for of a lookup of that ID alone."""
+        pairs = [(name, str(value)) for name, value in params.items() if name not in IGNORED_PARAMS]
+        return f"{resource}?{urlencode(sorted(pairs + [('id', item_id)]))}"
+
+    def _remember(self, key: str, entry: Tuple[str, bytes, str, float]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _entry(self, key: str) -> Tuple[Optional[Tuple[str, bytes, str, float]], str]:
+        # Caller holds the lock; returns the entry and the tier it came from
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            return entry, "memory_hits"
+
+        row = self._db.execute(
+            "SELECT etag, body, content_type, fresh_until FROM responses WHERE key = ? AND validated_at >= ?",
+            (key, time.time() - self.max_age),
+        ).fetchone()
+        if row is not None:
+            entry = (row[0], bytes(row[1]), row[2], row[3])
+            self._remember(key, entry)
+            return entry, "disk_hits"
+        return None, "misses"
+
+    def fresh(self, url: str) -> Optional[bytes]:
+        """Returns the stored body for a GET URL if it is still fresh, else None."""
+        key = self.key_for(url)
+        if key is None:
+            return None
+        with self._lock:
+            entry, _ = self._entry(key)
+            if entry is None or entry[3] <= time.time():
+                return None
+            self._count_fresh_hit(key)
+            return entry[1]
+
+    def _count_fresh_hit(self, key: str) -> None:
+        # Caller holds the lock
+        resource = key.split('?', 1)[0]
+        self._stats["fresh_hits"] += 1
+        self._fresh_hits_by_resource[resource] = self._fresh_hits_by_resource.get(resource, 0) + 1
+
+    def fresh_items(self, resource: str, ids: List[str], params: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Returns the still-fresh cached item for each ID that has one; the rest need fetching."""
+        found = {}
+        now = time.time()
+        with self._lock:
+            for item_id in ids:
+                key = self.item_key(resource, item_id, params)
+                entry, _ = self._entry(key)
+                if entry is None or entry[3] <= now:
+                    continue
+                try:
+                    items = json.loads(entry[1]).get('items') or []
+                except (ValueError, AttributeError):
+                    continue
+                if items and items[0].get('id') == item_id:
+                    found[item_id] = items[0]
+                    self._count_fresh_hit(key)
+        return found
+
+    def lookup(self, key: str) -> Optional[Tuple[str, bytes, str]]:
+        """Returns the stored (etag, body, content type) to revalidate, or None."""
+        with self._lock:
+            self._stats["requests"] += 1
+            entry, tier = self._entry(key)
+            # Items stored from combined calls have no ETag to revalidate with
+            if entry is not None and not entry[0]:
+                entry, tier = None, "misses"
+            self._stats[tier] += 1
+            return entry[:3] if entry is not None else None
+
+    def _fresh_until(self, key: str, body: bytes) -> float:
+        if self.policy is None:
+            return 0.0
+        try:
+            return time.time() + self.policy.ttl_for(key, body)
+        except Exception as e:
+            logger.warning(f"Could not work out freshness of cached response {key}: {e}")
+            return 0.0
+
+    def revalidated(self, key: str, entry: Tuple[str, bytes, str]) -> None:
+        """Records a 304 for a stored response, refreshing its age and freshness."""
+        fresh_until = self._fresh_until(key, entry[1])
+        with self._lock:
+            self._stats["revalidated"] += 1
+            self._stats["bytes_saved"] += len(entry[1])
+            self._remember(key, (*entry[:3], fresh_until))
+            try:
+                self._db.execute(
+                    "UPDATE responses SET validated_at = ?, fresh_until = ? WHERE key = ?",
+                    (time.time(), fresh_until, key),
+                )
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to refresh cached response {key}: {e}")
+
+    def store(self, key: str, etag: str, body: bytes, content_type: str, replaced: bool = False) -> None:
+        """Stores a 200 response body under its ETag."""
+        entry = (etag, body, content_type, self._fresh_until(key, body))
+        with self._lock:
+            self._remember(key, entry)
+            self._stats["stored"] += 1
+            if replaced:
+                self._stats["changed"] += 1
+            now = time.time()
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, etag, body, content_type, validated_at, fresh_until)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, etag, body, content_type, now, entry[3]),
+                )
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to persist cached response {key}: {e}")
+            if now - self._pruned_at >= PRUNE_INTERVAL:
+                self._prune(now)
+
+    def store_items(self, resource: str, params: Dict[str, Any], items: List[Dict[str, Any]]) -> None:
+        """Stores each item of a combined videos/channels response under its own item_key."""
+        now = time.time()
+        rows = []
+        for item in items:
+            if 'id' not in item:
+                continue
+            key = self.item_key(resource, item['id'], params)
+            body = json.dumps({'items': [item]}).encode()
+            rows.append((key, '', body, 'application/json', now, self._fresh_until(key, body)))
+        if not rows:
+            return
+        with self._lock:
+            for key, etag, body, content_type, _, fresh_until in rows:
+                self._remember(key, (etag, body, content_type, fresh_until))
+            self._stats["stored"] += len(rows)
+            try:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO responses (key, etag, body, content_type, validated_at, fresh_until)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to persist {len(rows)} cached {resource} items: {e}")
+            if now - self._pruned_at >= PRUNE_INTERVAL:
+                self._prune(now)
+
+    def stats(self) -> Dict[str, float]:
+        """Returns hit/miss/revalidation counters and rates."""
+        with self._lock:
+            stats = {
+                "memory_entries": len(self._memory), **self._stats,
+                "fresh_hits_by_resource": dict(self._fresh_hits_by_resource),
+            }
+        if self.policy is not None:
+            stats["freshness"] = self.policy.stats()
+        requests = stats["requests"] or 1
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["disk_hits"]) / requests, 3)
+        stats["miss_rate"] = round(stats["misses"] / requests, 3)
+        stats["revalidation_rate"] = round(stats["revalidated"] / requests, 3)
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+def get_response_cache() -> ResponseCache:
+    """Returns the process-wide response cache shared by both fetchers' transports."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(
+                path=settings.RESPONSE_CACHE_PATH,
+                max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+                max_age=settings.RESPONSE_CACHE_MAX_AGE,
+                policy=build_freshness_policy(),
+            )
+        return _cache
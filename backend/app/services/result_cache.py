@@ -0,0 +1,290 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import urlparse
+import asyncio
+import json
+import math
+import random
+import socket
+import sqlite3
+import threading
+import time
+from .quota import BATCH, quota_priority
+from ..config import settings
+from ..logger import logger
+
+@dataclass
+class CachedResult:
+    """An analysis result with its freshness: fresh until expires_at, then stale for stale_ttl."""
+    value: Any
+    expires_at: float
+    # Seconds the result took to compute; scales probabilistic early expiration
+    delta: float
+
+    def to_bytes(self) -> bytes:
+        return json.dumps({"value": self.value, "expires_at": self.expires_at, "delta": self.delta}).encode()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CachedResult":
+        entry = json.loads(data)
+        return cls(entry["value"], entry["expires_at"], entry["delta"])
+
+class ResultStoreError(Exception):
+    """Raised when the shared result store cannot be reached or refuses a command."""
+    pass
+
+class SQLiteResultStore:
+    """Shared result tier in a local SQLite (WAL) file; shared by processes on one host."""
+
+    def __init__(self, path: str):
+        """Opens (creating if needed) the SQLite store at path and prunes expired rows."""
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._db.execute("DELETE FROM results WHERE expires_at < ?", (time.time(),))
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM results WHERE key = ? AND expires_at >= ?", (key, time.time())
+            ).fetchone()
+        return bytes(row[0]) if row is not None else None
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, time.time() + ttl),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+class RedisResultStore:
+    """Shared result tier on any server speaking the Redis protocol (RESP2), using GET and SET PX.
+
+    One connection, used under a lock and reopened after any failure; keeps the
+    backend free of a client library dependency.
+    """
+
+    def __init__(self, url: str, timeout: float = 1.0, prefix: str = "audience_pulse:result:"):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip('/') or 0)
+        self.timeout = timeout
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._sock: Optional[socket.socket] = None
+        self._reader = None
+
+    def _connect(self) -> None:
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._reader = self._sock.makefile('rb')
+        if self.password:
+            self._send("AUTH", self.password)
+        if self.db:
+            self._send("SELECT", str(self.db))
+
+    def _disconnect(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = self._reader = None
+
+    def _send(self, *args: Any) -> Any:
+        encoded = [arg if isinstance(arg, bytes) else str(arg).encode() for arg in args]
+        payload = b"*%d\r\n" % len(encoded) + b"".join(b"$%d\r\n%s\r\n" % (len(arg), arg) for arg in encoded)
+        self._sock.sendall(payload)
+        return self._read_reply()
+
+    def _read_reply(self) -> Any:
+        line = self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ResultStoreError("Connection closed by result store")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest
+        if kind == b"-":
+            raise ResultStoreError(rest.decode(errors="replace"))
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            return None if length < 0 else self._reader.read(length + 2)[:-2]
+        if kind == b"*":
+            length = int(rest)
+            return None if length < 0 else [self._read_reply() for _ in range(length)]
+        raise ResultStoreError(f"Unexpected reply from result store: {line[:20]!r}")
+
+    def command(self, *args: Any) -> Any:
+        """Sends one command and returns its reply, reconnecting if needed."""
+        with self._lock:
+            try:
+                if self._sock is None:
+                    self._connect()
+                return self._send(*args)
+            except (OSError, ValueError) as e:
+                self._disconnect()
+                raise ResultStoreError(f"Result store at {self.host}:{self.port} unavailable: {e}")
+            except ResultStoreError:
+                self._disconnect()
+                raise
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.command("GET", self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.command("SET", self.prefix + key, value, "PX", max(int(ttl * 1000), 1))
+
+    def close(self) -> None:
+        with self._lock:
+            self._disconnect()
+
+class ResultCache:
+    """Cache of whole analysis results: an in-memory LRU over a pluggable shared store.
+
+    Results are fresh for `ttl` seconds and may then be served stale for another
+    `stale_ttl` while one background refresh recomputes them. To keep a popular
+    key from expiring for every caller at once, each hit may also trigger that
+    refresh early with a probability that grows as expiry approaches and with
+    how long the result took to compute (XFetch, weighted by `beta`). Shared
+    store failures are logged and treated as misses.
+    """
+
+    def __init__(self, store, max_entries: int, ttl: float, stale_ttl: float, beta: float):
+        self.store = store
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.beta = beta
+        self._memory: "OrderedDict[str, CachedResult]" = OrderedDict()
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._stats = {
+            "memory_hits": 0, "shared_hits": 0, "misses": 0, "stale_served": 0,
+            "early_refreshes": 0, "refreshes": 0, "refresh_failures": 0, "store_errors": 0,
+        }
+
+    def _remember(self, key: str, entry: CachedResult) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    async def _lookup(self, key: str, now: float) -> Optional[CachedResult]:
+        entry = self._memory.get(key)
+        if entry is not None and now <= entry.expires_at + self.stale_ttl:
+            self._memory.move_to_end(key)
+            self._stats["memory_hits"] += 1
+            return entry
+        if self.store is not None:
+            try:
+                data = await asyncio.to_thread(self.store.get, key)
+            except Exception as e:
+                self._stats["store_errors"] += 1
+                logger.warning(f"Result cache lookup of {key} failed: {e}")
+                data = None
+            if data is not None:
+                entry = CachedResult.from_bytes(data)
+                if now <= entry.expires_at + self.stale_ttl:
+                    self._remember(key, entry)
+                    self._stats["shared_hits"] += 1
+                    return entry
+        self._stats["misses"] += 1
+        return None
+
+    async def _compute(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        started = time.monotonic()
+        value = await compute()
+        entry = CachedResult(value, time.time() + self.ttl, time.monotonic() - started)
+        self._remember(key, entry)
+        if self.store is not None:
+            try:
+                await asyncio.to_thread(self.store.set, key, entry.to_bytes(), self.ttl + self.stale_ttl)
+            except Exception as e:
+                self._stats["store_errors"] += 1
+                logger.warning(f"Result cache store of {key} failed: {e}")
+        return value
+
+    def _refresh(self, key: str, compute: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._refreshing:
+            return
+
+        async def refresh():
+            # Refreshes are background work and yield quota to interactive requests
+            quota_priority.set(BATCH)
+            try:
+                await self._compute(key, compute)
+                self._stats["refreshes"] += 1
+            except Exception as e:
+                self._stats["refresh_failures"] += 1
+                logger.warning(f"Background refresh of {key} failed: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Returns the cached result for key, computing it on a miss and refreshing it in the background when due."""
+        now = time.time()
+        entry = await self._lookup(key, now)
+        if entry is None:
+            return await self._compute(key, compute)
+
+        if now > entry.expires_at:
+            self._stats["stale_served"] += 1
+            self._refresh(key, compute)
+        elif now - entry.delta * self.beta * math.log(random.random() or 1e-12) >= entry.expires_at:
+            self._stats["early_refreshes"] += 1
+            self._refresh(key, compute)
+        return entry.value
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss/refresh counters and the hit rate."""
+        stats = {
+            "backend": type(self.store).__name__ if self.store is not None else None,
+            "memory_entries": len(self._memory),
+            "refreshing": len(self._refreshing),
+            **self._stats,
+        }
+        lookups = (stats["memory_hits"] + stats["shared_hits"] + stats["misses"]) or 1
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["shared_hits"]) / lookups, 3)
+        return stats
+
+def build_result_store(backend: str):
+    """Builds the shared tier named by RESULT_CACHE_BACKEND: 'sqlite', 'redis', or 'memory' for none."""
+    if backend == "sqlite":
+        return SQLiteResultStore(settings.RESULT_CACHE_PATH)
+    if backend == "redis":
+        return RedisResultStore(settings.RESULT_CACHE_REDIS_URL)
+    if backend == "memory":
+        return None
+    raise ValueError(f"Unknown result cache backend: {backend}")
+
+_result_cache: Optional[ResultCache] = None
+_result_cache_lock = threading.Lock()
+
+def get_result_cache() -> ResultCache:
+    """Returns the process-wide analysis result cache."""
+    global _result_cache
+    with _result_cache_lock:
+        if _result_cache is None:
+            _result_cache = ResultCache(
+                store=build_result_store(settings.RESULT_CACHE_BACKEND),
+                max_entries=settings.RESULT_CACHE_MAX_ENTRIES,
+                ttl=settings.RESULT_CACHE_TTL,
+                stale_ttl=settings.RESULT_CACHE_STALE_TTL,
+                beta=settings.RESULT_CACHE_EARLY_BETA,
+            )
+        return _result_cache
@@ -0,0 +1,316 @@
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import json
+import random
+import threading
+import time
+from .quota import QuotaExceededError
+from ..config import settings
+from ..logger import logger
+
+# Failure kinds, from the classifiers below
+TRANSIENT = "transient"        # timeouts, dropped connections, 5xx
+RATE_LIMITED = "rate_limited"  # 429 and per-user rate limits; honour Retry-After
+QUOTA = "quota"                # daily quota gone; retrying cannot help
+FATAL = "fatal"                # any other 4xx; the request itself is wrong
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+# Data API error reasons, from error.errors[].reason in the response body
+QUOTA_REASONS = {'quotaExceeded', 'dailyLimitExceeded'}
+RATE_LIMIT_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded'}
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit breaker is open."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+# Calls refused locally, before reaching the API; these must propagate, not be swallowed
+REFUSED_ERRORS = (QuotaExceededError, CircuitOpenError)
+
+@dataclass
+class Failure:
+    """A classified failed attempt."""
+    kind: str
+    status: Optional[int] = None
+    reasons: tuple = ()
+    retry_after: Optional[float] = None
+
+def api_error_reasons(body: Any) -> List[str]:
+    """Returns the error.errors[].reason values of a Data API error body."""
+    try:
+        if isinstance(body, bytes):
+            body = body.decode('utf-8', 'replace')
+        errors = json.loads(body).get('error', {}).get('errors', [])
+        return [error.get('reason') for error in errors if error.get('reason')]
+    except (ValueError, AttributeError):
+        return []
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses a Retry-After header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+def classify_status(status: int, body: Any, retry_after: Optional[str] = None) -> Failure:
+    """Classifies an HTTP error response by status code and API error reason."""
+    reasons = tuple(api_error_reasons(body))
+    delay = parse_retry_after(retry_after)
+    if QUOTA_REASONS.intersection(reasons):
+        return Failure(QUOTA, status, reasons)
+    if status == 429 or RATE_LIMIT_REASONS.intersection(reasons):
+        return Failure(RATE_LIMITED, status, reasons, delay)
+    if status in RETRYABLE_STATUSES:
+        return Failure(TRANSIENT, status, reasons, delay)
+    return Failure(FATAL, status, reasons)
+
+@dataclass
+class RetryPolicy:
+    """How often and how long to retry one call."""
+    attempts: int
+    base_delay: float
+    max_delay: float
+
+    def delay(self, attempt: int, failure: Failure) -> Optional[float]:
+        """Full-jitter backoff, or the server's Retry-After; None if that is too long to wait."""
+        if failure.retry_after is not None:
+            return failure.retry_after if failure.retry_after <= self.max_delay else None
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+class RetryBudget:
+    """Process-wide token bucket that caps retries at a fraction of calls.
+
+    Every first attempt deposits `ratio` tokens and every retry spends one, so
+    during an upstream incident retries stop at roughly ratio x traffic instead
+    of multiplying it. A small per-second floor keeps retries possible at low
+    traffic.
+    """
+
+    def __init__(self, ratio: float, min_per_second: float, max_tokens: float):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self._lock = threading.Lock()
+        self._tokens = max_tokens
+        self._last_refill = time.monotonic()
+        self._stats = {"calls": 0, "retries": 0, "exhausted": 0}
+
+    def record_call(self) -> None:
+        with self._lock:
+            self._stats["calls"] += 1
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Takes a token for one retry; False means the retry must not happen."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.max_tokens, self._tokens + (now - self._last_refill) * self.min_per_second)
+            self._last_refill = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self._stats["retries"] += 1
+                return True
+            self._stats["exhausted"] += 1
+            return False
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {"tokens": round(self._tokens, 2), **self._stats}
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one API endpoint.
+
+    After `failure_threshold` transient or rate-limit failures in a row the
+    circuit opens and calls fail fast for `reset_timeout` seconds. Then a
+    single probe is let through: success closes the circuit, failure opens
+    it again. Responses such as 404 show the endpoint is up and count as
+    successes.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, endpoint: str, failure_threshold: int, reset_timeout: float):
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._times_opened = 0
+
+    def before_call(self) -> None:
+        """Raises CircuitOpenError unless a call may go through now."""
+        with self._lock:
+            if self._state == self.OPEN:
+                remaining = self._opened_at + self.reset_timeout - time.monotonic()
+                if remaining > 0:
+                    raise CircuitOpenError(
+                        f"YouTube API endpoint '{self.endpoint}' is failing, try again later", retry_after=remaining
+                    )
+                self._state = self.HALF_OPEN
+            if self._state == self.HALF_OPEN:
+                if self._probing:
+                    raise CircuitOpenError(
+                        f"YouTube API endpoint '{self.endpoint}' is recovering, try again later",
+                        retry_after=self.reset_timeout,
+                    )
+                self._probing = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info(f"Circuit for '{self.endpoint}' closed")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self._times_opened += 1
+                    logger.warning(f"Circuit for '{self.endpoint}' opened after {self._failures} failures")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """Frees the probe slot after an attempt that says nothing about the endpoint."""
+        with self._lock:
+            self._probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"state": self._state, "consecutive_failures": self._failures, "times_opened": self._times_opened}
+
+class RetryEngine:
+    """Runs API calls under a retry policy, the shared retry budget and per-endpoint breakers.
+
+    `classify` maps an exception to a Failure, or None for exceptions that are
+    not API failures (those propagate untouched). Only transient and
+    rate-limit failures are retried.
+    """
+
+    def __init__(self, budget: RetryBudget, failure_threshold: int, reset_timeout: float):
+        self.budget = budget
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self._gave_up = 0
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        with self._lock:
+            if endpoint not in self._breakers:
+                self._breakers[endpoint] = CircuitBreaker(endpoint, self.failure_threshold, self.reset_timeout)
+            return self._breakers[endpoint]
+
+    def _after_failure(self, breaker: CircuitBreaker, error: Exception, classify, policy: RetryPolicy,
+                       attempt: int) -> Optional[float]:
+        """Updates the breaker and returns the delay before the next attempt, or None to give up."""
+        failure = classify(error)
+        if failure is None:
+            breaker.release()
+            return None
+        if failure.kind in (TRANSIENT, RATE_LIMITED):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+            return None
+
+        if attempt >= policy.attempts - 1:
+            self._count_give_up()
+            return None
+        delay = policy.delay(attempt, failure)
+        if delay is None or not self.budget.try_spend():
+            self._count_give_up()
+            return None
+        logger.warning(
+            f"Call to '{breaker.endpoint}' failed ({failure.kind}, status {failure.status}) on attempt "
+            f"{attempt + 1}, retrying in {delay:.2f}s"
+        )
+        return delay
+
+    def _count_give_up(self) -> None:
+        with self._lock:
+            self._gave_up += 1
+
+    def call_blocking(self, endpoint: str, func: Callable[[], Any], classify, policy: RetryPolicy) -> Any:
+        """Runs func with retries, sleeping the calling thread between attempts."""
+        breaker = self.breaker(endpoint)
+        self.budget.record_call()
+        for attempt in range(policy.attempts):
+            breaker.before_call()
+            try:
+                result = func()
+            except Exception as e:
+                delay = self._after_failure(breaker, e, classify, policy, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+            else:
+                breaker.record_success()
+                return result
+
+    async def call(self, endpoint: str, func: Callable[[], Awaitable[Any]], classify, policy: RetryPolicy) -> Any:
+        """Runs func with retries, awaiting between attempts."""
+        breaker = self.breaker(endpoint)
+        self.budget.record_call()
+        for attempt in range(policy.attempts):
+            breaker.before_call()
+            try:
+                result = await func()
+            except asyncio.CancelledError:
+                breaker.release()
+                raise
+            except Exception as e:
+                delay = self._after_failure(breaker, e, classify, policy, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+            else:
+                breaker.record_success()
+                return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns budget counters and the state of every endpoint's breaker."""
+        with self._lock:
+            breakers = dict(self._breakers)
+            gave_up = self._gave_up
+        return {
+            "budget": self.budget.stats(),
+            "gave_up": gave_up,
+            "circuits": {endpoint: breaker.stats() for endpoint, breaker in breakers.items()},
+        }
+
+_engine: Optional[RetryEngine] = None
+_engine_lock = threading.Lock()
+
+def get_retry_engine() -> RetryEngine:
+    """Returns the process-wide retry engine shared by both fetchers."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = RetryEngine(
+                budget=RetryBudget(
+                    ratio=settings.RETRY_BUDGET_RATIO,
+                    min_per_second=settings.RETRY_BUDGET_MIN_PER_SECOND,
+                    max_tokens=settings.RETRY_BUDGET_MAX_TOKENS,
+                ),
+                failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+                reset_timeout=settings.CIRCUIT_RESET_TIMEOUT,
+            )
+        return _engine
@@ -0,0 +1,57 @@
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+import asyncio
+import threading
+from ..logger import logger
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one in-flight computation.
+
+    The first caller for a key starts the work as a task; callers arriving while
+    it runs await that same task. Each caller awaits through a shield, so a
+    caller that is cancelled (a client disconnecting, say) stops waiting
+    without cancelling the work the other callers depend on.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._stats = {"started": 0, "coalesced": 0, "abandoned": 0}
+
+    def _finished(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark a failure as retrieved even if every caller has gone away
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"Shared computation for {key!r} failed: {task.exception()}")
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Returns func()'s result, sharing one run among concurrent callers with the same key."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+            self._stats["started"] += 1
+        else:
+            self._stats["coalesced"] += 1
+
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done():
+                self._stats["abandoned"] += 1
+            raise
+
+    def stats(self) -> Dict[str, int]:
+        """Returns counts of started and coalesced calls and those currently in flight."""
+        return {"in_flight": len(self._inflight), **self._stats}
+
+_analysis_flights: Optional[SingleFlight] = None
+_analysis_flights_lock = threading.Lock()
+
+def get_analysis_flights() -> SingleFlight:
+    """Returns the process-wide single-flight group for /analyze requests."""
+    global _analysis_flights
+    with _analysis_flights_lock:
+        if _analysis_flights is None:
+            _analysis_flights = SingleFlight()
+        return _analysis_flights
@@ -0,0 +1,270 @@
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+import http.client
+import queue
+import ssl
+import threading
+import httplib2
+from .deadlines import close_http_connections
+from .response_cache import ResponseCache
+from ..config import settings
+from ..logger import logger
+
+class ConnectionStats:
+    """Thread-safe connection counters shared by every transport in a pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {"handshakes": 0, "tls_resumed": 0, "evicted": 0}
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[name] += amount
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+class TLSSessionCache:
+    """Stands in for a connection's SSLContext to resume TLS sessions across connections.
+
+    Sessions can only be resumed through the context that created them, so the
+    context httplib2 built for the first connection bound here, with its CA
+    bundle and TLS settings, is shared by every later connection configured
+    the same way. The last session seen for each host is offered on the next
+    handshake with that host.
+    """
+
+    def __init__(self, stats: ConnectionStats):
+        self._stats = stats
+        self._lock = threading.Lock()
+        self._context: Optional[ssl.SSLContext] = None
+        self._settings: Optional[tuple] = None
+        self._sessions: Dict[str, ssl.SSLSession] = {}
+
+    @staticmethod
+    def _settings_of(conn) -> tuple:
+        return (
+            getattr(conn, 'ca_certs', None), getattr(conn, 'disable_ssl_certificate_validation', False),
+            getattr(conn, 'cert_file', None), getattr(conn, 'key_file', None),
+        )
+
+    def bind(self, conn) -> None:
+        """Makes an HTTPS connection handshake through the shared context, keeping its own if configured differently."""
+        context = getattr(conn, '_context', None)
+        if context is None or context is self:
+            return
+        settings_key = self._settings_of(conn)
+        with self._lock:
+            if self._context is None:
+                self._context, self._settings = context, settings_key
+            elif settings_key != self._settings:
+                return
+        conn._context = self
+
+    def wrap_socket(self, sock, server_hostname=None, **kwargs):
+        session = self._sessions.get(server_hostname)
+        ssl_sock = self._context.wrap_socket(sock, server_hostname=server_hostname, session=session, **kwargs)
+        self._stats.incr("handshakes")
+        if ssl_sock.session_reused:
+            self._stats.incr("tls_resumed")
+        return ssl_sock
+
+    def remember(self, host: str, sock) -> None:
+        """Stores the socket's current session; TLS 1.3 tickets arrive after the handshake."""
+        session = getattr(sock, 'session', None)
+        if session is not None:
+            self._sessions[host] = session
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._context, name)
+
+class TimeoutHttp(httplib2.Http):
+    """httplib2.Http whose connections carry their own connect and read timeouts.
+
+    httplib2 only knows a single socket timeout, which it applies while
+    connecting; once a connection is up its socket is switched to the read
+    timeout. Nothing touches socket.setdefaulttimeout, so concurrent fetches
+    cannot see each other's settings. With a response cache, GETs of cacheable
+    resources are sent as conditional requests and a 304 is answered from it.
+    """
+
+    def __init__(self, connect_timeout: float = None, read_timeout: float = None,
+                 tls_sessions: Optional[TLSSessionCache] = None,
+                 response_cache: Optional[ResponseCache] = None, **kwargs):
+        """Initializes the transport; timeouts default to the YOUTUBE_*_TIMEOUT settings."""
+        if connect_timeout is None:
+            connect_timeout = settings.YOUTUBE_CONNECT_TIMEOUT
+        if read_timeout is None:
+            read_timeout = settings.YOUTUBE_READ_TIMEOUT
+        super().__init__(timeout=connect_timeout, **kwargs)
+        self.read_timeout = read_timeout
+        self.tls_sessions = tls_sessions
+        self.response_cache = response_cache
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        key = self.response_cache.key_for(uri) if self.response_cache and method == "GET" else None
+        if key is None:
+            return super().request(uri, method, body, headers, **kwargs)
+
+        cached = self.response_cache.lookup(key)
+        headers = dict(headers or {})
+        if cached is not None:
+            headers['if-none-match'] = cached[0]
+        response, content = super().request(uri, method, body, headers, **kwargs)
+
+        if response.status == 304 and cached is not None:
+            self.response_cache.revalidated(key, cached)
+            etag, content, content_type = cached
+            response = httplib2.Response({'status': '200', 'etag': etag, 'content-type': content_type})
+            response.fromcache = True
+        elif response.status == 200 and response.get('etag'):
+            self.response_cache.store(
+                key, response['etag'], content, response.get('content-type', 'application/json'),
+                replaced=cached is not None,
+            )
+        return response, content
+
+    def _conn_request(self, conn, request_uri, method, body, headers):
+        if not getattr(conn, '_read_timeout_applied', False):
+            connect = conn.connect
+
+            def connect_with_read_timeout():
+                connect()
+                conn.sock.settimeout(self.read_timeout)
+
+            conn.connect = connect_with_read_timeout
+            conn._read_timeout_applied = True
+            if conn.sock is not None:
+                conn.sock.settimeout(self.read_timeout)
+            if self.tls_sessions is not None:
+                self.tls_sessions.bind(conn)
+
+        result = super()._conn_request(conn, request_uri, method, body, headers)
+        if self.tls_sessions is not None and isinstance(conn.sock, ssl.SSLSocket):
+            self.tls_sessions.remember(conn.host, conn.sock)
+        return result
+
+    def open_connections(self) -> int:
+        """Number of this transport's connections that currently hold a socket."""
+        return sum(1 for conn in list(self.connections.values()) if getattr(conn, 'sock', None) is not None)
+
+# Errors that mean the connection itself is unusable, as opposed to an HTTP error status
+CONNECTION_ERRORS = (OSError, http.client.HTTPException, httplib2.HttpLib2Error)
+
+class TransportPoolTimeout(TimeoutError):
+    """Raised when no transport frees up within the pool-acquire timeout."""
+    pass
+
+class TransportPool:
+    """Bounded pool of TimeoutHttp transports that calls check out and return.
+
+    httplib2.Http is not thread-safe, so each in-flight call gets a transport
+    to itself. Idle transports are handed out last-in first-out, which keeps
+    the most recently used (and therefore warm) connections busy. When a call
+    fails at the connection level only that transport's connections are
+    evicted; every other warm connection stays in service.
+    """
+
+    def __init__(self, size: int = None, acquire_timeout: float = None,
+                 read_timeout: float = None, response_cache: Optional[ResponseCache] = None):
+        """Initializes an empty pool; transports are created lazily up to size."""
+        self.size = size if size is not None else settings.YOUTUBE_TRANSPORT_POOL_SIZE
+        self.acquire_timeout = acquire_timeout if acquire_timeout is not None else settings.YOUTUBE_POOL_TIMEOUT
+        self.read_timeout = read_timeout
+        self.response_cache = response_cache
+        self.connection_stats = ConnectionStats()
+        self.tls_sessions = TLSSessionCache(self.connection_stats)
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._transports = set()
+        self._in_use = 0
+        self._discarded = 0
+        self._acquire_timeouts = 0
+
+    def _new_transport(self) -> TimeoutHttp:
+        return TimeoutHttp(read_timeout=self.read_timeout, tls_sessions=self.tls_sessions,
+                           response_cache=self.response_cache)
+
+    def acquire(self) -> TimeoutHttp:
+        """Checks out a transport, creating one if the pool is below its size."""
+        try:
+            http = self._idle.get_nowait()
+        except queue.Empty:
+            http = None
+            with self._lock:
+                if len(self._transports) < self.size:
+                    http = self._new_transport()
+                    self._transports.add(http)
+            if http is None:
+                try:
+                    http = self._idle.get(timeout=self.acquire_timeout)
+                except queue.Empty:
+                    with self._lock:
+                        self._acquire_timeouts += 1
+                    raise TransportPoolTimeout(
+                        f"No transport available after {self.acquire_timeout} seconds"
+                    )
+        with self._lock:
+            self._in_use += 1
+        return http
+
+    def release(self, http: TimeoutHttp, discard: bool = False) -> None:
+        """Returns a transport to the pool, or closes and drops it so a fresh one replaces it."""
+        with self._lock:
+            self._in_use -= 1
+            # A transport the pool no longer tracks, or one beyond its size, is overflow
+            if http not in self._transports or self._idle.qsize() >= self.size:
+                discard = True
+            if discard:
+                self._transports.discard(http)
+                self._discarded += 1
+        if discard:
+            close_http_connections(http)
+        else:
+            self._idle.put(http)
+
+    def evict(self, http: TimeoutHttp) -> None:
+        """Closes a transport's connections; its next call opens a fresh one."""
+        evicted = len(http.connections)
+        close_http_connections(http)
+        if evicted:
+            self.connection_stats.incr("evicted", evicted)
+            logger.info(f"Evicted {evicted} broken connection(s), other pooled connections kept")
+
+    @contextmanager
+    def checkout(self):
+        """Context manager around acquire/release that evicts broken connections."""
+        http = self.acquire()
+        discard = False
+        try:
+            yield http
+        except TimeoutError:
+            # An abandoned call may still be unwinding on this transport
+            discard = True
+            raise
+        except CONNECTION_ERRORS:
+            self.evict(http)
+            raise
+        finally:
+            self.release(http, discard=discard)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns pool occupancy and connection health counters."""
+        with self._lock:
+            transports = list(self._transports)
+            in_use = self._in_use
+            discarded = self._discarded
+            acquire_timeouts = self._acquire_timeouts
+        idle_transports = list(self._idle.queue)
+        return {
+            "size": self.size,
+            "created": len(transports),
+            "in_use": in_use,
+            "idle": len(idle_transports),
+            "open_connections": sum(http.open_connections() for http in transports),
+            "idle_connections": sum(http.open_connections() for http in idle_transports),
+            "discarded": discarded,
+            "acquire_timeouts": acquire_timeouts,
+            **self.connection_stats.snapshot(),
+        }
@@ -0,0 +1,739 @@
+from typing import Optional, List, Dict, Any, AsyncIterator
+import asyncio
+import copy
+import json
+import httpx
+from .youtube_client import (
+    CHANNEL_DETAIL_PARTS,
+    OWNER_CHANNEL_PARTS,
+    VIDEO_DETAIL_PARTS,
+    FetchConfig,
+    YouTubeFetcherError,
+    assemble_channel_data,
+    assemble_video_data,
+    channel_section,
+    comment_limit,
+    comment_page_params,
+    comments_section,
+    found_items,
+    is_youtube_url,
+    link_lookup_ids,
+    merge_selected_details,
+    owner_channel_ids,
+    owner_section,
+    parse_video_id,
+    pick_channel_search_match,
+    playlist_page_params,
+    playlist_page_video_ids,
+    prefetch_params,
+    select_popularity_extremes,
+    selected_video_ids,
+    summary_details_request,
+    uploads_playlist_id,
+    video_section,
+    videos_section,
+)
+from .transport import ConnectionStats
+from .quota import QuotaExceededError, QuotaScheduler, get_quota_scheduler, quota_cost
+from .response_cache import ResponseCache, get_response_cache
+from .batcher import IdBatcher, batch_key
+from .retry import (
+    QUOTA_REASONS,
+    REFUSED_ERRORS,
+    TRANSIENT,
+    Failure,
+    api_error_reasons,
+    classify_status,
+    get_retry_engine,
+)
+from .channel_cache import MISSING, ChannelIdCache, get_channel_id_cache, handle_cache_key
+from .resolution import CHEAP_STRATEGIES, ResolutionFailed, get_resolution_planner, handle_search_variant
+from .links import CHANNEL, CUSTOM_URL, HANDLE, USER, VIDEO, YOUTUBE, route_link
+from ..config import settings
+from ..logger import logger
+
+YOUTUBE_API_BASE_URL = "https://www.googleapis.com/youtube/v3/"
+
+_http_client: Optional[httpx.AsyncClient] = None
+_connection_stats = ConnectionStats()
+
+async def _trace_connection(event_name: str, info: Dict[str, Any]) -> None:
+    """httpcore trace hook counting TLS handshakes on the shared pool."""
+    if event_name == "connection.start_tls.complete":
+        _connection_stats.incr("handshakes")
+
+def classify_httpx_error(error: Exception) -> Optional[Failure]:
+    """Classifies a failed httpx call for the retry engine; None if not an API failure."""
+    if isinstance(error, httpx.HTTPStatusError):
+        response = error.response
+        return classify_status(response.status_code, response.content, response.headers.get('retry-after'))
+    if isinstance(error, httpx.PoolTimeout):
+        # Local pool saturation says nothing about the API
+        return None
+    if isinstance(error, (httpx.TransportError, TimeoutError)):
+        return Failure(TRANSIENT)
+    return None
+
+class CachingTransport(httpx.AsyncBaseTransport):
+    """Wraps a transport to send cacheable GETs as conditional requests.
+
+    A 304 is answered with the stored body; a 200 carrying an ETag is stored.
+    The cache's SQLite tier blocks, so it is only touched off the event loop.
+    """
+
+    # Hop-by-hop and body framing headers that no longer apply to a decoded body
+    _FRAMING_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding')
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, cache: ResponseCache):
+        self.inner = inner
+        self.cache = cache
+
+    def _response(self, request: httpx.Request, response: httpx.Response, body: bytes, **headers) -> httpx.Response:
+        kept = [(name, value) for name, value in response.headers.items()
+                if name.lower() not in self._FRAMING_HEADERS and name.lower() not in headers]
+        return httpx.Response(
+            200, headers=kept + list(headers.items()), content=body,
+            extensions=response.extensions, request=request,
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key = self.cache.key_for(str(request.url)) if request.method == "GET" else None
+        if key is None:
+            return await self.inner.handle_async_request(request)
+
+        cached = await asyncio.to_thread(self.cache.lookup, key)
+        if cached is not None:
+            request.headers['If-None-Match'] = cached[0]
+        response = await self.inner.handle_async_request(request)
+
+        if response.status_code == 304 and cached is not None:
+            await response.aclose()
+            await asyncio.to_thread(self.cache.revalidated, key, cached)
+            etag, body, content_type = cached
+            return self._response(request, response, body, etag=etag, **{'content-type': content_type})
+        if response.status_code == 200 and response.headers.get('etag'):
+            body = await response.aread()
+            await asyncio.to_thread(
+                self.cache.store, key, response.headers['etag'], body,
+                response.headers.get('content-type', 'application/json'), replaced=cached is not None,
+            )
+            return self._response(request, response, body)
+        return response
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+def get_http_client() -> httpx.AsyncClient:
+    """Returns the process-wide AsyncClient shared by all async fetchers."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        transport = httpx.AsyncHTTPTransport(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=30.0,
+            ),
+        )
+        _http_client = httpx.AsyncClient(
+            base_url=YOUTUBE_API_BASE_URL,
+            transport=CachingTransport(transport, get_response_cache()),
+            timeout=httpx.Timeout(
+                connect=settings.YOUTUBE_CONNECT_TIMEOUT,
+                read=settings.YOUTUBE_READ_TIMEOUT,
+                write=settings.YOUTUBE_WRITE_TIMEOUT,
+                pool=settings.YOUTUBE_POOL_TIMEOUT,
+            ),
+        )
+    return _http_client
+
+def http_client_stats() -> Dict[str, int]:
+    """Returns open/idle connection counts and health counters for the shared client."""
+    transport = getattr(_http_client, '_transport', None)
+    pool = getattr(getattr(transport, 'inner', transport), '_pool', None)
+    connections = list(getattr(pool, 'connections', []))
+    return {
+        "open_connections": sum(1 for conn in connections if not conn.is_closed()),
+        "idle_connections": sum(1 for conn in connections if conn.is_idle()),
+        **_connection_stats.snapshot(),
+    }
+
+async def close_http_client() -> None:
+    """Closes the process-wide AsyncClient and its pooled connections."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+class AsyncYouTubeFetcher:
+    """Asyncio YouTube Data API v3 fetcher on a shared HTTP/2 connection pool."""
+
+    def __init__(self, api_key: str, config: Optional[FetchConfig] = None, timeout: int = 15,
+                 client: Optional[httpx.AsyncClient] = None, quota: Optional[QuotaScheduler] = None,
+                 channel_cache: Optional[ChannelIdCache] = None, response_cache: Optional[ResponseCache] = None):
+        """Initializes the fetcher with an API key, configuration and optional HTTP client."""
+        if not api_key:
+            raise ValueError("API key is required")
+
+        self.api_key = api_key
+        self.timeout = timeout
+        self.config = config or FetchConfig()
+        self._client = client
+        self._comment_page_slots = asyncio.Semaphore(self.config.max_concurrent_comment_pages)
+        self.quota = quota or get_quota_scheduler()
+        self.channel_cache = channel_cache or get_channel_id_cache()
+        # The same cache the shared client's CachingTransport fills
+        self.response_cache = response_cache or get_response_cache()
+        self.planner = get_resolution_planner()
+        self.id_batcher = IdBatcher(self._fetch_ids, settings.YOUTUBE_BATCH_WINDOW)
+        # ID lookups answered up front by prefetch, by batch key
+        self.known_items: Dict[Any, Dict[str, Any]] = {}
+        self.retries = get_retry_engine()
+
+    def with_config(self, config: FetchConfig) -> "AsyncYouTubeFetcher":
+        """Returns a fetcher sharing this one's client, quota and caches but using config."""
+        fetcher = copy.copy(self)
+        fetcher.config = config
+        return fetcher
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client used for API calls; defaults to the process-wide one."""
+        return self._client or get_http_client()
+
+    def _validate_url(self, url: str) -> bool:
+        """Validates if the provided URL is a valid YouTube URL."""
+        return is_youtube_url(url)
+
+    def _extract_video_id(self, video_url: str) -> Optional[str]:
+        """Extracts video ID from various YouTube URL formats."""
+        return parse_video_id(video_url)
+
+    async def _api_get(self, resource: str, **params) -> Dict[str, Any]:
+        """Issues a single GET against a Data API resource and returns the JSON body."""
+        await self.quota.acquire(resource)
+        params['key'] = self.api_key
+        # Phase timeouts live on the client; this bounds the call as a whole
+        try:
+            async with asyncio.timeout(self.timeout):
+                response = await self.client.get(resource, params=params, extensions={"trace": _trace_connection})
+        except (httpx.TransportError, TimeoutError):
+            # The pool drops a broken or abandoned connection; the rest stay warm
+            _connection_stats.incr("evicted")
+            raise
+        response.raise_for_status()
+        return response.json()
+
+    async def _retry_api_call(self, resource: str, **params) -> Dict[str, Any]:
+        """Runs an API call under the shared retry engine: backoff, retry budget and circuit breaker."""
+        # A response still fresh in the cache costs no quota and no round trip
+        url = str(self.client.build_request("GET", resource, params=params).url)
+        fresh = await asyncio.to_thread(self.response_cache.fresh, url)
+        if fresh is not None:
+            return json.loads(fresh)
+        try:
+            return await self.retries.call(
+                resource, lambda: self._api_get(resource, **params), classify_httpx_error, self.config.retry_policy()
+            )
+        except httpx.HTTPStatusError as e:
+            if QUOTA_REASONS.intersection(api_error_reasons(e.response.content)):
+                self.quota.mark_exhausted()
+                raise QuotaExceededError("YouTube API daily quota exceeded")
+            raise
+        except httpx.PoolTimeout:
+            raise
+        except (httpx.TimeoutException, TimeoutError) as e:
+            raise YouTubeFetcherError(f"API call to {resource} timed out: {e!r}")
+        except httpx.TransportError as e:
+            raise YouTubeFetcherError(f"Connection failed: {e!r}")
+
+    async def _extract_channel_id(self, youtube_link: str) -> Optional[str]:
+        """Enhanced channel ID extraction with better error handling."""
+        target = route_link(youtube_link)
+        if target.platform != YOUTUBE:
+            logger.error(f"Invalid YouTube URL: {youtube_link}")
+            return None
+
+        channel_id = None
+
+        try:
+            # Handle video URLs
+            if target.kind == VIDEO:
+                video_details = await self._get_video_details([target.value])
+                if video_details:
+                    channel_id = video_details[0].get('snippet', {}).get('channelId')
+
+            # Handle direct channel URLs
+            elif target.kind == CHANNEL:
+                channel_id = target.value
+
+            # Handle @ handles
+            elif target.kind == HANDLE:
+                logger.info(f"Extracted handle: {target.value}")
+                channel_id = await self._cached_resolve(
+                    handle_cache_key(HANDLE, target.value), lambda: self._resolve_handle(target.value)
+                )
+
+            # Handle legacy formats (/c/, /user/)
+            elif target.kind in (CUSTOM_URL, USER):
+                channel_id = await self._cached_resolve(
+                    handle_cache_key(target.kind, target.value), lambda: self._search_channel_by_query(target.value)
+                )
+
+        except REFUSED_ERRORS:
+            raise
+        except Exception as e:
+            logger.error(f"Error extracting channel ID from {youtube_link}: {e}")
+
+        if channel_id:
+            logger.info(f"Successfully extracted channel ID: {channel_id}")
+        else:
+            logger.error(f"Failed to extract channel ID from {youtube_link}")
+
+        return channel_id
+
+    async def _cached_resolve(self, cache_key: str, resolve) -> Optional[str]:
+        """Resolves a handle or custom URL through the channel ID cache."""
+        # The cache's SQLite tier blocks, so it is read and written off the event loop
+        cached = await asyncio.to_thread(self.channel_cache.get, cache_key)
+        if cached is not MISSING:
+            logger.info(f"Channel ID cache hit for {cache_key}: {cached}")
+            return cached
+
+        channel_id = await resolve()
+        await asyncio.to_thread(self.channel_cache.set, cache_key, channel_id)
+        return channel_id
+
+    async def _resolve_handle(self, handle: str) -> Optional[str]:
+        """Resolves a handle: cheap lookups raced first, searches only as a budgeted fallback."""
+        clean_handle = handle.lstrip('@')
+        logger.info(f"Searching for channel with handle: {clean_handle}")
+
+        failure = None
+        try:
+            channel_id = await self._race_cheap_lookups(clean_handle)
+            if channel_id:
+                return channel_id
+        except ResolutionFailed as e:
+            failure = e
+
+        channel_id = await self._run_search_fallbacks(clean_handle)
+        if channel_id is None and failure is not None:
+            raise failure
+        return channel_id
+
+    async def _race_cheap_lookups(self, clean_handle: str) -> Optional[str]:
+        """Runs the 1-unit forHandle and forUsername lookups concurrently; a forHandle hit always wins."""
+        tasks = {
+            'for_handle': asyncio.create_task(self._lookup_channel(forHandle=f"@{clean_handle}")),
+            'for_username': asyncio.create_task(self._lookup_channel(forUsername=clean_handle)),
+        }
+        try:
+            # A legacy username can belong to another channel, so it only counts once forHandle comes back empty
+            for name in CHEAP_STRATEGIES:
+                channel_id = await tasks[name]
+                self.planner.record(name, bool(channel_id))
+                if channel_id:
+                    logger.info(f"Found channel via {name}: {channel_id}")
+                    return channel_id
+        finally:
+            for task in tasks.values():
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    # Retrieved so an unused lookup's failure is not logged as never retrieved
+                    task.exception()
+        return None
+
+    async def _lookup_channel(self, **lookup) -> Optional[str]:
+        """channels.list by forHandle or forUsername; returns the channel ID or None."""
+        try:
+            response = await self._retry_api_call(
+                'channels', part='id', **lookup, **self.config.fields('channel_lookup')
+            )
+            if response.get('items'):
+                return response['items'][0]['id']
+        except REFUSED_ERRORS:
+            raise
+        except Exception as e:
+            logger.warning(f"Channel lookup {lookup} failed: {e}")
+            raise ResolutionFailed(f"Channel lookup {lookup} failed: {e}") from e
+        return None
+
+    async def _run_search_fallbacks(self, clean_handle: str) -> Optional[str]:
+        """Tries the 100-unit search strategies, best performers first, within the search budget."""
+        strategies = {
+            'basic_search': self._basic_search,
+            'quoted_search': self._quoted_search,
+            'variant_search': self._try_direct_handle_resolution,
+        }
+        spent = 0
+        failure = None
+        for name in self.planner.search_order():
+            if spent + quota_cost('search') > self.planner.search_budget:
+                logger.info(f"Search budget of {self.planner.search_budget} units spent for handle: {clean_handle}")
+                break
+            if name == 'variant_search' and not handle_search_variant(clean_handle):
+                continue
+
+            spent += quota_cost('search')
+            try:
+                channel_id = await strategies[name](clean_handle)
+            except ResolutionFailed as e:
+                failure = e
+                continue
+            self.planner.record(name, bool(channel_id))
+            if channel_id:
+                return channel_id
+
+        logger.error(f"All search strategies failed for handle: {clean_handle}")
+        if failure is not None:
+            raise failure
+        return None
+
+    async def _basic_search(self, clean_handle: str) -> Optional[str]:
+        """search.list for the handle, picking the best title match."""
+        try:
+            logger.info(f"Trying basic search for: {clean_handle}")
+            response = await self._retry_api_call(
+                'search', q=clean_handle, type='channel', part='snippet', maxResults=10,
+                **self.config.fields('channel_search')
+            )
+            logger.info(f"Basic search returned {len(response.get('items', []))} results")
+            return pick_channel_search_match(response.get('items', []), clean_handle)
+        except REFUSED_ERRORS:
+            raise
+        except Exception as e:
+            logger.error(f"Basic search failed: {e}")
+            raise ResolutionFailed(f"Basic search failed: {e}") from e
+
+    async def _quoted_search(self, clean_handle: str) -> Optional[str]:
+        """search.list for the quoted handle, taking the top result."""
+        try:
+            logger.info(f"Trying quoted search for: \"{clean_handle}\"")
+            response = await self._retry_api_call(
+                'search', q=f'"{clean_handle}"', type='channel', part='snippet', maxResults=5,
+                **self.config.fields('channel_search')
+            )
+            if response.get('items'):
+                channel_id = response['items'][0]['id']['channelId']
+                title = response['items'][0]['snippet']['title']
+                logger.info(f"Found via quoted search: {title} -> {channel_id}")
+                return channel_id
+        except REFUSED_ERRORS:
+            raise
+        except Exception as e:
+            logger.error(f"Quoted search failed: {e}")
+            raise ResolutionFailed(f"Quoted search failed: {e}") from e
+        return None
+
+    async def _try_direct_handle_resolution(self, handle: str) -> Optional[str]:
+        """Searches for the handle with '_' and '-' as spaces, requiring a title match."""
+        clean_handle = handle.lstrip('@')
+        query = handle_search_variant(clean_handle)
+        if not query:
+            return None
+
+        try:
+            logger.info(f"Trying direct handle resolution with query: {query}")
+            response = await self._retry_api_call(
+                'search', q=query, type='channel', part='snippet', maxResults=3,
+                **self.config.fields('channel_search')
+            )
+            for item in response.get('items', []):
+                channel_id = item['id']['channelId']
+                title = item['snippet']['title']
+
+                if clean_handle.lower() in title.lower() or query.lower() in title.lower():
+                    logger.info(f"Direct resolution found match: {title} -> {channel_id}")
+                    return channel_id
+
+        except REFUSED_ERRORS:
+            raise
+        except Exception as e:
+            logger.debug(f"Direct resolution failed for query '{query}': {e}")
+            raise ResolutionFailed(f"Direct resolution failed for query '{query}': {e}") from e
+
+        logger.info(f"Direct handle resolution failed for: {clean_handle}")
+        return None
+
+    async def _search_channel_by_query(self, query: str) -> Optional[str]:
+        """Search for channel by query string."""
+        try:
+            response = await self._retry_api_call(
+                'search', q=query, type='channel', part='id', maxResults=5, **self.config.fields('channel_search')
+            )
+            if response.get('items'):
+                return response['items'][0]['id']['channelId']
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Error searching for channel by query '{query}': {e}")
+            raise ResolutionFailed(f"Search for channel by query '{query}' failed: {e}") from e
+        return None
+
+    async def _get_channel_uploads_playlist_id(self, channel_id: str) -> Optional[str]:
+        """Retrieves the uploads playlist ID for a channel."""
+        try:
+            channel = await self._get_channel(channel_id, 'contentDetails', 'channel_uploads')
+            if channel:
+                return uploads_playlist_id(channel)
+        except httpx.HTTPStatusError as e:
+            logger.error(f"API error getting uploads playlist for channel {channel_id}: {e}")
+        return None
+
+    async def _iter_playlist_video_id_pages(self, playlist_id: str, max_results: int = None) -> AsyncIterator[List[str]]:
+        """Yields each playlistItems page of video IDs as soon as it is fetched."""
+        if max_results is None:
+            max_results = self.config.max_videos
+
+        fetched = 0
+        page_token = None
+        try:
+            while fetched < max_results:
+                params = playlist_page_params(self.config, playlist_id, max_results, page_token)
+                response = await self._retry_api_call('playlistItems', **params)
+                batch_ids = playlist_page_video_ids(response, max_results - fetched)
+                fetched += len(batch_ids)
+                if batch_ids:
+                    yield batch_ids
+
+                page_token = response.get('nextPageToken')
+                if not page_token:
+                    break
+
+        except httpx.HTTPStatusError as e:
+            logger.error(f"API error for playlist {playlist_id}: {e}")
+
+    async def _get_playlist_video_details(self, playlist_id: str, max_results: int = None) -> List[Dict[str, Any]]:
+        """Pipelines playlist paging with videos.list: each page's details are fetched while the next page loads."""
+        semaphore = asyncio.Semaphore(self.config.max_concurrent_video_batches)
+
+        async def fetch_page_details(page_ids):
+            async with semaphore:
+                return await self._get_summary_details(page_ids)
+
+        tasks = []
+        try:
+            async for page_ids in self._iter_playlist_video_id_pages(playlist_id, max_results):
+                tasks.append(asyncio.create_task(fetch_page_details(page_ids)))
+            pages = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        return [video for page in pages for video in page]
+
+    async def _get_summary_details(self, video_ids: List[str]) -> List[Dict[str, Any]]:
+        """Fetches the upload summary: full details, or statistics only in two-pass mode."""
+        part, call_site = summary_details_request(self.config)
+        return await self._get_video_details(video_ids, part=part, call_site=call_site)
+
+    async def _get_video_details(self, video_ids: List[str], part: str = VIDEO_DETAIL_PARTS,
+                                 call_site: str = 'video_details') -> List[Dict[str, Any]]:
+        """Retrieves detailed information for video IDs, batched with concurrent lookups."""
+        if not video_ids:
+            return []
+
+        try:
+            found = await self._load_ids('videos', video_ids, part=part, **self.config.fields(call_site))
+        except httpx.HTTPStatusError as e:
+            logger.error(f"API error getting video details: {e}")
+            return []
+
+        return found_items(found)
+
+    async def _get_channel(self, channel_id: str, part: str, call_site: str) -> Optional[Dict[str, Any]]:
+        """Retrieves one channel, batched with concurrent lookups; None if it does not exist."""
+        found = await self._load_ids('channels', [channel_id], part=part, **self.config.fields(call_site))
+        return found[channel_id]
+
+    async def _load_ids(self, resource: str, ids: List[str], **params) -> Dict[str, Any]:
+        """Looks IDs up through the batcher, except those prefetch answered or the cache holds fresh."""
+        known = self.known_items.get(batch_key(resource, params), {})
+        missing = [item_id for item_id in ids if item_id not in known]
+        if missing:
+            # Freshness is per ID; only stale or unseen IDs join a combined call
+            known = {**known, **await asyncio.to_thread(self.response_cache.fresh_items, resource, missing, params)}
+            missing = [item_id for item_id in missing if item_id not in known]
+        found = await self.id_batcher.load_many(resource, missing, **params) if missing else {}
+        return {item_id: known[item_id] if item_id in known else found[item_id] for item_id in ids}
+
+    async def prefetch(self, links: List[str]) -> "AsyncYouTubeFetcher":
+        """Looks up the videos and channels behind many links in shared 50-ID calls.
+
+        Returns a copy of this fetcher that answers those lookups without calling
+        the API again, or this fetcher unchanged if the lookups fail.
+        """
+        video_ids, channel_ids = link_lookup_ids(links)
+        video_params, channel_params, owner_params = prefetch_params(self.config)
+        try:
+            videos, channels = await asyncio.gather(
+                self._load_ids('videos', video_ids, **video_params),
+                self._load_ids('channels', channel_ids, **channel_params),
+            )
+            owner_ids = owner_channel_ids(videos)
+            owners = await self._load_ids('channels', owner_ids, **owner_params)
+        except Exception as e:
+            # Each analysis can still look up its own IDs
+            logger.warning(f"Prefetching IDs for {len(links)} links failed: {e}")
+            return self
+
+        fetcher = copy.copy(self)
+        fetcher.known_items = {
+            **self.known_items,
+            batch_key('videos', video_params): videos,
+            batch_key('channels', channel_params): channels,
+            batch_key('channels', owner_params): owners,
+        }
+        return fetcher
+
+    async def _fetch_ids(self, resource: str, ids: List[str], params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Issues one combined list call for up to 50 IDs on behalf of the batcher."""
+        response = await self._retry_api_call(resource, id=','.join(ids), **params)
+        items = response.get('items', [])
+        if len(ids) > 1:
+            await asyncio.to_thread(self.response_cache.store_items, resource, params, items)
+        return items
+
+    async def iter_comment_pages(self, video_id: str, max_comments: int = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yields pages of comment threads for a video as they arrive, up to the per-video cap."""
+        if not self.config.enable_comments:
+            return
+
+        max_comments = comment_limit(self.config, max_comments)
+
+        fetched = 0
+        page_token = None
+        try:
+            while fetched < max_comments:
+                params = comment_page_params(self.config, video_id, max_comments - fetched, page_token)
+                # Bounds comment pages in flight across every video being fetched
+                async with self._comment_page_slots:
+                    response = await self._retry_api_call('commentThreads', **params)
+
+                items = response.get('items', [])[:max_comments - fetched]
+                fetched += len(items)
+                if items:
+                    yield items
+
+                page_token = response.get('nextPageToken')
+                if not page_token:
+                    break
+
+        except httpx.HTTPStatusError as e:
+            if 'commentsDisabled' in api_error_reasons(e.response.content):
+                logger.info(f"Comments disabled for video {video_id}")
+            else:
+                logger.error(f"API error getting comments for video {video_id}: {e}")
+
+    async def _get_comments_for_video(self, video_id: str, max_comments: int = None) -> List[Dict[str, Any]]:
+        """Retrieves all comment pages for a video up to the per-video cap."""
+        return [comment async for page in self.iter_comment_pages(video_id, max_comments) for comment in page]
+
+    def _comment_tasks(self, video_ids: List[str]) -> List[asyncio.Task]:
+        """Starts one bounded fan-out over the videos' comments; each task returns (video_id, comments)."""
+        concurrency = self.config.max_workers if self.config.enable_concurrent_fetching else 1
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch_comments(video_id):
+            async with semaphore:
+                return video_id, await self._get_comments_for_video(video_id)
+
+        return [asyncio.create_task(fetch_comments(video_id)) for video_id in dict.fromkeys(video_ids)]
+
+    async def iter_channel_data(self, channel_link: str) -> AsyncIterator[Dict[str, Any]]:
+        """Yields the channel analysis section by section: channel, videos, then comments per video as each completes."""
+        logger.info(f"Starting async data fetch for channel: {channel_link}")
+
+        try:
+            channel_id = await self._extract_channel_id(channel_link)
+            if not channel_id:
+                raise YouTubeFetcherError(f"Could not extract channel ID from {channel_link}")
+
+            channel_details = await self._get_channel(channel_id, CHANNEL_DETAIL_PARTS, 'channel_details')
+            if not channel_details:
+                raise YouTubeFetcherError(f"Channel {channel_id} not found")
+            yield channel_section(channel_id, channel_details)
+
+            # The details already carry the uploads playlist unless a field mask dropped it
+            playlist_id = uploads_playlist_id(channel_details) or await self._get_channel_uploads_playlist_id(channel_id)
+            if not playlist_id:
+                raise YouTubeFetcherError(f"Could not find uploads playlist for channel {channel_id}")
+
+            video_details = await self._get_playlist_video_details(playlist_id)
+            if not video_details:
+                logger.warning(f"No videos found for channel {channel_id}")
+
+            most_popular, least_popular = select_popularity_extremes(video_details, self.config)
+
+            # One fan-out for both sets; videos in both are fetched once
+            selected_ids = selected_video_ids(most_popular, least_popular)
+            comment_tasks = self._comment_tasks(selected_ids)
+            try:
+                if self.config.two_pass_details:
+                    # Second pass: full details for just the selected videos, while their comments load
+                    detailed = await self._get_video_details(selected_ids)
+                    most_popular, least_popular = merge_selected_details(most_popular, least_popular, detailed)
+                yield videos_section(video_details, most_popular, least_popular)
+
+                for next_done in asyncio.as_completed(comment_tasks):
+                    video_id, comments = await next_done
+                    yield comments_section(video_id, comments)
+            finally:
+                # A consumer that stops early must not leave fetches running
+                for task in comment_tasks:
+                    task.cancel()
+
+        except YouTubeFetcherError:
+            raise
+        except REFUSED_ERRORS:
+            raise
+        except Exception as e:
+            logger.exception(f"Unexpected error for channel {channel_link}")
+            raise YouTubeFetcherError(f"Unexpected error: {str(e)}")
+
+    async def get_channel_data(self, channel_link: str) -> Dict[str, Any]:
+        """Fetches channel details, its recent uploads and comments on top/bottom videos."""
+        return assemble_channel_data([section async for section in self.iter_channel_data(channel_link)])
+
+    async def iter_video_data(self, video_link: str) -> AsyncIterator[Dict[str, Any]]:
+        """Yields the video analysis section by section: video, channel, then its comments."""
+        logger.info(f"Starting async data fetch for video: {video_link}")
+
+        try:
+            video_id = self._extract_video_id(video_link)
+            if not video_id:
+                raise YouTubeFetcherError(f"Could not extract video ID from {video_link}")
+
+            video_details_list = await self._get_video_details([video_id])
+            if not video_details_list:
+                raise YouTubeFetcherError(f"Video {video_id} not found")
+
+            current_video_details = video_details_list[0]
+            channel_id = current_video_details.get('snippet', {}).get('channelId')
+
+            if not channel_id:
+                raise YouTubeFetcherError(f"Could not determine channel ID for video {video_id}")
+            yield video_section(channel_id, current_video_details)
+
+            # Channel details and comments are independent, so fetch them together
+            channel_task = asyncio.create_task(self._get_channel(channel_id, OWNER_CHANNEL_PARTS, 'channel_details'))
+            comments_task = asyncio.create_task(self._get_comments_for_video(video_id))
+            try:
+                yield owner_section(await channel_task)
+                yield comments_section(video_id, await comments_task)
+            finally:
+                channel_task.cancel()
+                comments_task.cancel()
+
+        except YouTubeFetcherError:
+            raise
+        except REFUSED_ERRORS:
+            raise
+        except Exception as e:
+            logger.exception(f"Unexpected error for video {video_link}")
+            raise YouTubeFetcherError(f"Unexpected error: {str(e)}")
+
+    async def get_video_data(self, video_link: str) -> Dict[str, Any]:
+        """Fetches data for a single video, its channel and its comments."""
+        return assemble_video_data([section async for section in self.iter_video_data(video_link)])
@@ -1,327 +1,660 @@
-from urllib.parse import urlparse, parse_qs
-from typing import Optional, List, Dict, Any
-from dataclasses import dataclass
-from googleapiclient.discovery import build
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple
+from dataclasses import dataclass, field, replace
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
 from googleapiclient.errors import HttpError
-import time
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from functools import lru_cache
+from contextvars import copy_context
+import copy
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from .deadlines import get_deadline_scheduler
+from .transport import CONNECTION_ERRORS, TimeoutHttp, TransportPool, TransportPoolTimeout
+from .quota import QuotaExceededError, QuotaScheduler, get_quota_scheduler, quota_cost
+from .response_cache import ResponseCache, get_response_cache
+from .batcher import BlockingIdBatcher, batch_key
+from .retry import (
+    QUOTA_REASONS,
+    REFUSED_ERRORS,
+    TRANSIENT,
+    Failure,
+    RetryPolicy,
+    api_error_reasons,
+    classify_status,
+    get_retry_engine,
+)
+from .channel_cache import MISSING, ChannelIdCache, get_channel_id_cache, handle_cache_key
+from .resolution import CHEAP_STRATEGIES, ResolutionFailed, get_resolution_planner, handle_search_variant
+from .links import CHANNEL, CUSTOM_URL, HANDLE, USER, VIDEO, YOUTUBE, route_link
+from ..config import settings
 from ..logger import logger
 
+# Product spec: analyze up to 1000 comments per video
+MAX_COMMENTS_PER_VIDEO = 1000
+# commentThreads.list returns at most 100 threads per page
+COMMENT_PAGE_SIZE = 100
+
+# Partial-response projection (fields=) each call site requests, limited to what
+# the analysis reads; FetchConfig.field_masks overrides them per site
+FIELD_MASKS = {
+    'channel_lookup': 'items(id)',
+    'channel_search': 'items(id/channelId,snippet/title)',
+    'channel_uploads': 'items(id,contentDetails/relatedPlaylists/uploads)',
+    'channel_details': 'items(id,snippet(title,description,customUrl,publishedAt,country),statistics,'
+                       'contentDetails/relatedPlaylists/uploads)',
+    'playlist_items': 'nextPageToken,items/contentDetails(videoId,videoPublishedAt)',
+    'video_details': 'items(id,snippet(channelId,title,description,publishedAt,tags,categoryId),'
+                     'statistics,contentDetails/duration)',
+    'video_statistics': 'items(id,snippet(channelId,title,publishedAt),statistics)',
+    'comment_threads': 'nextPageToken,items(id,snippet(totalReplyCount,topLevelComment(id,'
+                       'snippet(authorDisplayName,authorChannelId,textDisplay,likeCount,publishedAt))))',
+}
+
+# Parts each lookup requests; lookups only share a combined call when these match
+VIDEO_DETAIL_PARTS = 'snippet,statistics,contentDetails'
+CHANNEL_DETAIL_PARTS = 'snippet,statistics,contentDetails'
+OWNER_CHANNEL_PARTS = 'snippet,statistics'
+
+# Call sites whose results are matched back to the requested IDs by items/id
+ID_MATCHED_SITES = {'channel_lookup', 'channel_uploads', 'channel_details', 'video_details', 'video_statistics'}
+
+def _expand_field_mask(mask: str, pos: int, prefix: str) -> Tuple[List[str], int]:
+    paths = []
+    while True:
+        start = pos
+        while pos < len(mask) and mask[pos] not in ',()':
+            pos += 1
+        name = mask[start:pos].strip()
+        if not name:
+            raise ValueError(f"Malformed field mask: {mask}")
+        if pos < len(mask) and mask[pos] == '(':
+            nested, pos = _expand_field_mask(mask, pos + 1, f"{prefix}{name}/")
+            if pos >= len(mask) or mask[pos] != ')':
+                raise ValueError(f"Malformed field mask: {mask}")
+            paths.extend(nested)
+            pos += 1
+        else:
+            paths.append(prefix + name)
+        if pos < len(mask) and mask[pos] == ',':
+            pos += 1
+            continue
+        return paths, pos
+
+def field_mask_paths(mask: str) -> List[str]:
+    """Expands a fields= mask into the paths it selects, e.g. 'items(id,snippet/title)' -> items/id, items/snippet/title."""
+    paths, end = _expand_field_mask(mask, 0, "")
+    if end != len(mask):
+        raise ValueError(f"Malformed field mask: {mask}")
+    return paths
+
+def field_mask_selects(mask: str, path: str) -> bool:
+    """Tells whether a fields= mask returns path, selected itself, through an ancestor or a '*'."""
+    wanted = path.split('/')
+    for selected in field_mask_paths(mask):
+        segments = selected.split('/')
+        if len(segments) <= len(wanted) and all(s in ('*', w) for s, w in zip(segments, wanted)):
+            return True
+    return False
+
+def check_field_mask_sites(overrides: Dict[str, Optional[str]]) -> None:
+    """Raises ValueError for field mask overrides naming an unknown call site or dropping a needed items/id."""
+    unknown = set(overrides) - set(FIELD_MASKS)
+    if unknown:
+        raise ValueError(f"Unknown field mask call sites: {', '.join(sorted(unknown))}")
+    for site, mask in overrides.items():
+        if mask and site in ID_MATCHED_SITES and not field_mask_selects(mask, 'items/id'):
+            raise ValueError(f"Field mask for {site} must keep items/id, which results are matched by: {mask}")
+
 @dataclass
 class FetchConfig:
     """Configuration class for YouTube fetcher settings."""
     max_videos: int = 50
-    max_comments_per_video: int = 100
+    max_comments_per_video: int = MAX_COMMENTS_PER_VIDEO
+    max_concurrent_comment_pages: int = 10  # Comment pages in flight across all videos
     popular_videos_count: int = 5
     least_popular_videos_count: int = 5
     retry_attempts: int = 5  # Increased from 3 to handle SSL issues
-    retry_delay: float = 2.0  # Increased from 1.0 to give more time between retries
+    retry_delay: float = 2.0  # Base of the full-jitter backoff
+    retry_max_delay: float = 30.0  # Backoff cap; a longer Retry-After is not waited out
     enable_comments: bool = True
     enable_concurrent_fetching: bool = True
     max_workers: int = 5
+    max_concurrent_video_batches: int = 4  # videos.list calls overlapping playlist paging
+    two_pass_details: bool = False  # Statistics for every upload, full details only for the selected videos
+    field_masks: Dict[str, Optional[str]] = field(default_factory=dict)  # Per-site FIELD_MASKS overrides; None fetches whole parts
+
+    def __post_init__(self):
+        check_field_mask_sites(self.field_masks)
+
+    def fields(self, call_site: str) -> Dict[str, str]:
+        """Returns the fields= parameter for a call site, or nothing if masking is off."""
+        mask = self.field_masks.get(call_site, FIELD_MASKS[call_site])
+        return {'fields': mask} if mask else {}
+
+    def retry_policy(self) -> RetryPolicy:
+        """Returns the retry policy for API calls made with this config."""
+        return RetryPolicy(self.retry_attempts, self.retry_delay, self.retry_max_delay)
+
+    def with_field_masks(self, overrides: Dict[str, Optional[str]]) -> "FetchConfig":
+        """Returns a copy whose projections are widened (or narrowed) for the given call sites."""
+        return replace(self, field_masks={**self.field_masks, **overrides})
 
 class YouTubeFetcherError(Exception):
     """Custom exception for YouTube fetcher errors."""
     pass
 
-def execute_with_timeout(func, timeout_seconds=30):
-    """Execute a function with timeout using ThreadPoolExecutor."""
-    with ThreadPoolExecutor(max_workers=1) as executor:
-        future = executor.submit(func)
-        try:
-            return future.result(timeout=timeout_seconds)
-        except FutureTimeoutError:
-            future.cancel()
-            raise TimeoutError(f"Operation timed out after {timeout_seconds} seconds")
+@lru_cache(maxsize=1)
+def load_discovery_document() -> Dict[str, Any]:
+    """Loads and parses the bundled YouTube v3 discovery document once per process."""
+    document = get_static_doc('youtube', 'v3')
+    if document is None:
+        raise YouTubeFetcherError("Bundled discovery document for youtube v3 is missing")
+    return json.loads(document)
+
+def is_youtube_url(url: str) -> bool:
+    """Validates if the provided URL is a valid YouTube URL."""
+    return route_link(url).platform == YOUTUBE
+
+def parse_video_id(video_url: str) -> Optional[str]:
+    """Extracts video ID from various YouTube URL formats."""
+    target = route_link(video_url)
+    return target.value if target.platform == YOUTUBE and target.kind == VIDEO else None
+
+def link_lookup_ids(links: List[str]) -> Tuple[List[str], List[str]]:
+    """Returns the video IDs and channel IDs that can be read off links without an API call."""
+    video_ids, channel_ids = [], []
+    for link in links:
+        target = route_link(link)
+        if target.platform != YOUTUBE:
+            continue
+        if target.kind == VIDEO:
+            video_ids.append(target.value)
+        elif target.kind == CHANNEL:
+            channel_ids.append(target.value)
+    return list(dict.fromkeys(video_ids)), list(dict.fromkeys(channel_ids))
+
+def pick_channel_search_match(items: List[Dict[str, Any]], handle: str) -> Optional[str]:
+    """Picks the channel ID that best matches a handle from search.list results."""
+    if not items:
+        return None
+
+    # Look through results for best match
+    for item in items:
+        channel_id = item['id']['channelId']
+        title = item['snippet']['title']
+        
+        logger.info(f"Found result: '{title}' -> {channel_id}")
+        
+        # Check for reasonable matches
+        title_lower = title.lower()
+        handle_lower = handle.lower()
+        
+        if (handle_lower in title_lower or
+            title_lower in handle_lower or
+            any(word in title_lower for word in handle_lower.split()) and len(handle_lower.split()) > 1):
+            
+            logger.info(f"Matched channel: {title} -> {channel_id}")
+            return channel_id
+    
+    # If no good match found, return first result as fallback
+    first_result = items[0]
+    first_channel_id = first_result['id']['channelId']
+    first_title = first_result['snippet']['title']
+    logger.info(f"Using first result as fallback: {first_title} -> {first_channel_id}")
+    return first_channel_id
+
+def select_popularity_extremes(video_details: List[Dict[str, Any]], config: FetchConfig):
+    """Sorts videos by view count and returns the (most popular, least popular) slices."""
+    # Sort by view count (handle missing statistics gracefully)
+    video_details.sort(
+        key=lambda x: int(x.get('statistics', {}).get('viewCount', 0)), 
+        reverse=True
+    )
+
+    # Get top and bottom videos
+    popular_count = min(config.popular_videos_count, len(video_details))
+    least_popular_count = min(config.least_popular_videos_count, len(video_details))
+    
+    most_popular = video_details[:popular_count]
+    least_popular = video_details[-least_popular_count:] if len(video_details) > popular_count else []
+    return most_popular, least_popular
+
+def assemble_channel_data(sections: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Builds the get_channel_data result from the sections iter_channel_data yields."""
+    data: Dict[str, Any] = {}
+    comments_by_video: Dict[str, List[Dict[str, Any]]] = {}
+    for section in sections:
+        if section["event"] == "comments":
+            comments_by_video[section["data"]["video_id"]] = section["data"]["comments"]
+        else:
+            data.update(section["data"])
+
+    return {
+        "channel_id": data["channel_id"],
+        "channel_details": data["channel_details"],
+        "all_videos_summary": data["all_videos_summary"],
+        "most_popular_videos_with_comments": [
+            {'video': video, 'comments': comments_by_video.get(video['id'], [])} for video in data["most_popular_videos"]
+        ],
+        "least_popular_videos_with_comments": [
+            {'video': video, 'comments': comments_by_video.get(video['id'], [])} for video in data["least_popular_videos"]
+        ]
+    }
+
+def assemble_video_data(sections: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Builds the get_video_data result from the sections iter_video_data yields."""
+    data: Dict[str, Any] = {}
+    for section in sections:
+        data.update(section["data"])
+
+    return {
+        "channel_id": data["channel_id"],
+        "channel_details": data["channel_details"],
+        "current_video_details": data["current_video_details"],
+        "current_video_comments": data["comments"]
+    }
+
+def merge_video_details(videos: List[Dict[str, Any]], detailed: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Swaps summary entries for their full videos.list payloads where one was fetched."""
+    by_id = {video['id']: video for video in detailed}
+    return [by_id.get(video['id'], video) for video in videos]
+
+def unique_video_ids(videos: List[Dict[str, Any]]) -> List[str]:
+    """Returns the videos' IDs in order with duplicates removed."""
+    return list(dict.fromkeys(video['id'] for video in videos))
+
+def selected_video_ids(most_popular: List[Dict[str, Any]], least_popular: List[Dict[str, Any]]) -> List[str]:
+    """Returns the videos whose comments are analyzed; a video in both sets is listed once."""
+    return unique_video_ids(most_popular + least_popular)
+
+def merge_selected_details(most_popular: List[Dict[str, Any]], least_popular: List[Dict[str, Any]],
+                           detailed: List[Dict[str, Any]]):
+    """Swaps both selections' summary entries for the full details of two-pass mode."""
+    return merge_video_details(most_popular, detailed), merge_video_details(least_popular, detailed)
+
+def summary_details_request(config: FetchConfig) -> Tuple[str, str]:
+    """Returns the (part, call site) of the upload summary: full details, or statistics only in two-pass mode."""
+    if config.two_pass_details:
+        return 'snippet,statistics', 'video_statistics'
+    return VIDEO_DETAIL_PARTS, 'video_details'
+
+def prefetch_params(config: FetchConfig) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    """Returns the videos, channels and video-owner lookup params prefetch must match the analyses' own."""
+    return (
+        {'part': VIDEO_DETAIL_PARTS, **config.fields('video_details')},
+        {'part': CHANNEL_DETAIL_PARTS, **config.fields('channel_details')},
+        {'part': OWNER_CHANNEL_PARTS, **config.fields('channel_details')},
+    )
+
+def owner_channel_ids(videos: Dict[str, Any]) -> List[str]:
+    """Returns the channels that own the looked-up videos, in order with duplicates removed."""
+    return list(dict.fromkeys(
+        video['snippet']['channelId'] for video in videos.values() if video and video.get('snippet', {}).get('channelId')
+    ))
+
+def found_items(found: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Returns the looked-up items in request order, dropping IDs the API did not return."""
+    return [item for item in found.values() if item]
+
+def uploads_playlist_id(channel: Dict[str, Any]) -> Optional[str]:
+    """Reads the uploads playlist ID off a channels.list item, if its mask kept it."""
+    return channel.get('contentDetails', {}).get('relatedPlaylists', {}).get('uploads')
+
+def playlist_page_params(config: FetchConfig, playlist_id: str, max_results: int,
+                         page_token: Optional[str]) -> Dict[str, Any]:
+    """Returns the playlistItems.list params for one page of an uploads playlist."""
+    params = {
+        'part': 'contentDetails',
+        'playlistId': playlist_id,
+        'maxResults': min(max_results, 50),
+        **config.fields('playlist_items'),
+    }
+    if page_token:
+        params['pageToken'] = page_token
+    return params
+
+def playlist_page_video_ids(response: Dict[str, Any], remaining: int) -> List[str]:
+    """Returns a playlistItems page's video IDs, cut to the number still wanted."""
+    return [item['contentDetails']['videoId'] for item in response.get('items', [])][:remaining]
+
+def comment_limit(config: FetchConfig, max_comments: Optional[int]) -> int:
+    """Returns the per-video comment cap: the requested one, else the config's, never above the product limit."""
+    if max_comments is None:
+        max_comments = config.max_comments_per_video
+    return min(max_comments, MAX_COMMENTS_PER_VIDEO)
+
+def comment_page_params(config: FetchConfig, video_id: str, remaining: int,
+                        page_token: Optional[str]) -> Dict[str, Any]:
+    """Returns the commentThreads.list params for the next page of a video's comments."""
+    params = {
+        'part': 'snippet',
+        'videoId': video_id,
+        'maxResults': min(remaining, COMMENT_PAGE_SIZE),
+        'textFormat': 'plainText',
+        **config.fields('comment_threads'),
+    }
+    if page_token:
+        params['pageToken'] = page_token
+    return params
+
+def channel_section(channel_id: str, channel_details: Dict[str, Any]) -> Dict[str, Any]:
+    """The first iter_channel_data section: the analyzed channel."""
+    return {"event": "channel", "data": {"channel_id": channel_id, "channel_details": channel_details}}
+
+def videos_section(video_details: List[Dict[str, Any]], most_popular: List[Dict[str, Any]],
+                   least_popular: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """The iter_channel_data section with the upload summary and both selections."""
+    return {"event": "videos", "data": {
+        "all_videos_summary": video_details,
+        "most_popular_videos": most_popular,
+        "least_popular_videos": least_popular,
+    }}
+
+def video_section(channel_id: str, current_video_details: Dict[str, Any]) -> Dict[str, Any]:
+    """The first iter_video_data section: the analyzed video."""
+    return {"event": "video", "data": {"channel_id": channel_id, "current_video_details": current_video_details}}
+
+def owner_section(channel_details: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """The iter_video_data section with the video's channel."""
+    return {"event": "channel", "data": {"channel_details": channel_details}}
+
+def comments_section(video_id: str, comments: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """One video's comments, in either analysis."""
+    return {"event": "comments", "data": {"video_id": video_id, "comments": comments}}
+
+def classify_googleapi_error(error: Exception) -> Optional[Failure]:
+    """Classifies a failed googleapiclient call for the retry engine; None if not an API failure."""
+    if isinstance(error, HttpError):
+        return classify_status(error.resp.status, error.content, error.resp.get('retry-after'))
+    if isinstance(error, TransportPoolTimeout):
+        # Local pool saturation says nothing about the API
+        return None
+    if isinstance(error, (TimeoutError,) + CONNECTION_ERRORS):
+        return Failure(TRANSIENT)
+    return None
+
+def execute_with_timeout(func, timeout_seconds=30, on_timeout=None):
+    """Execute a function with a deadline on the shared deadline scheduler."""
+    return get_deadline_scheduler().call(func, timeout_seconds, on_timeout)
 
 class YouTubeFetcher:
     """Enhanced YouTube Data API v3 fetcher with improved error handling and performance."""
 
-    def __init__(self, api_key: str, config: Optional[FetchConfig] = None, timeout: int = 15):
+    def __init__(self, api_key: str, config: Optional[FetchConfig] = None, timeout: int = 15,
+                 quota: Optional[QuotaScheduler] = None,
+                 channel_cache: Optional[ChannelIdCache] = None,
+                 response_cache: Optional[ResponseCache] = None):
         """Initializes the YouTubeFetcher with an API key and configuration."""
         if not api_key:
             raise ValueError("API key is required")
 
         self.api_key = api_key  # Store API key for rebuilding client if needed
-        self.timeout = timeout  # Reduced default timeout from 30 to 15 seconds
+        self.timeout = timeout  # Per-call deadline and read timeout
         
-        # Build client with timeout configuration
+        # Build client on a transport that carries its own timeouts
         self.youtube = self._build_youtube_client()
         self.config = config or FetchConfig()
+
+        # Requests are executed on pooled transports, one per concurrent call
+        self.response_cache = response_cache or get_response_cache()
+        self.transports = TransportPool(read_timeout=self.timeout, response_cache=self.response_cache)
+        self._comment_page_slots = threading.BoundedSemaphore(self.config.max_concurrent_comment_pages)
+        self.quota = quota or get_quota_scheduler()
+        self.channel_cache = channel_cache or get_channel_id_cache()
+        self.planner = get_resolution_planner()
+        # Races the cheap channel lookups of every concurrent resolution
+        self._lookup_executor = ThreadPoolExecutor(
+            max_workers=len(CHEAP_STRATEGIES) * settings.FETCH_EXECUTOR_MAX_WORKERS,
+            thread_name_prefix="channel-lookup",
+        )
+        self.id_batcher = BlockingIdBatcher(self._fetch_ids, settings.YOUTUBE_BATCH_WINDOW)
+        # ID lookups answered up front by prefetch, by batch key
+        self.known_items: Dict[Any, Dict[str, Any]] = {}
+        self.retries = get_retry_engine()
         
 
+    def with_config(self, config: FetchConfig) -> "YouTubeFetcher":
+        """Returns a fetcher sharing this one's client, transports and caches but using config."""
+        fetcher = copy.copy(self)
+        fetcher.config = config
+        return fetcher
+
+    def close(self) -> None:
+        """Stops the lookup threads; copies made by with_config share them and stop too."""
+        self._lookup_executor.shutdown(wait=False, cancel_futures=True)
+
     def _build_youtube_client(self):
-        """Build YouTube client with proper timeout configuration."""
-        import socket
-        
-        # Set socket timeout globally for this client
-        socket.setdefaulttimeout(self.timeout)
-        
-        try:
-            client = build('youtube', 'v3', developerKey=self.api_key)
-            return client
-        finally:
-            # Reset socket timeout to avoid affecting other parts of application
-            socket.setdefaulttimeout(None)
+        """Build YouTube client on a transport with per-connection timeouts."""
+        return build_from_document(
+            load_discovery_document(),
+            developerKey=self.api_key,
+            http=TimeoutHttp(read_timeout=self.timeout)
+        )
+
+    def _execute(self, request, timeout: Optional[float] = None):
+        """Executes a request on a checked-out transport within a deadline."""
+        # methodId looks like 'youtube.search.list'
+        self.quota.acquire_blocking(request.methodId.split('.')[1])
+        with self.transports.checkout() as http:
+            return execute_with_timeout(
+                lambda: request.execute(http=http),
+                timeout or self.timeout,
+                on_timeout=lambda: self.transports.evict(http)
+            )
 
     def _validate_url(self, url: str) -> bool:
         """Validates if the provided URL is a valid YouTube URL."""
-        try:
-            parsed = urlparse(url)
-            return parsed.netloc in ['www.youtube.com', 'youtube.com', 'youtu.be']
-        except Exception:
-            return False
+        return is_youtube_url(url)
 
     def _retry_api_call(self, func, *args, **kwargs):
-        """Retry mechanism for API calls with timeout and error handling."""
-        for attempt in range(self.config.retry_attempts):
-            try:
-                # Execute API call with timeout
-                def api_call():
-                    request = func(*args, **kwargs)
-                    return request.execute()
-                
-                result = execute_with_timeout(api_call, self.timeout)
-                return result
-                
-            except (TimeoutError, FutureTimeoutError) as e:
-                logger.warning(f"API call timed out on attempt {attempt + 1}: {e}")
-                if attempt < self.config.retry_attempts - 1:
-                    wait_time = self.config.retry_delay * (2 ** attempt)
-                    logger.info(f"Retrying after {wait_time}s...")
-                    time.sleep(wait_time)
-                    
-                    # Rebuild client on timeout
-                    try:
-                        logger.info("Rebuilding YouTube client due to timeout")
-                        self.youtube = self._build_youtube_client()
-                    except Exception as rebuild_error:
-                        logger.warning(f"Failed to rebuild client: {rebuild_error}")
-                    continue
-                else:
-                    raise YouTubeFetcherError(f"API call timed out after {self.config.retry_attempts} attempts")
-                    
-            except HttpError as e:
-                if e.resp.status == 429:  # Rate limit exceeded
-                    wait_time = self.config.retry_delay * (2 ** attempt)
-                    logger.warning(f"Rate limit hit, waiting {wait_time}s before retry {attempt + 1}")
-                    time.sleep(wait_time)
-                    continue
-                elif e.resp.status in [500, 502, 503, 504]:  # Server errors
-                    if attempt < self.config.retry_attempts - 1:
-                        time.sleep(self.config.retry_delay)
-                        continue
-                raise
-            except Exception as e:
-                error_str = str(e)
-                # Handle SSL and connection errors specifically
-                if any(ssl_error in error_str.lower() for ssl_error in ['ssl', 'connection', 'timeout', 'record layer', 'read operation timed out']):
-                    if attempt < self.config.retry_attempts - 1:
-                        wait_time = self.config.retry_delay * (2 ** attempt)
-                        logger.warning(f"Connection/SSL error on attempt {attempt + 1}: {error_str}")
-                        logger.info(f"Retrying after {wait_time}s...")
-                        time.sleep(wait_time)
-                        
-                        # Try to rebuild the YouTube client on SSL errors
-                        try:
-                            logger.info("Rebuilding YouTube client due to connection error")
-                            self.youtube = self._build_youtube_client()
-                        except Exception as rebuild_error:
-                            logger.warning(f"Failed to rebuild client: {rebuild_error}")
-                        
-                        continue
-                    else:
-                        logger.error(f"Connection failed after {self.config.retry_attempts} attempts")
-                        raise YouTubeFetcherError(f"Connection failed after {self.config.retry_attempts} attempts: {error_str}")
-                else:
-                    if attempt < self.config.retry_attempts - 1:
-                        time.sleep(self.config.retry_delay)
-                        continue
-                raise
-        raise YouTubeFetcherError(f"Failed after {self.config.retry_attempts} attempts")
+        """Runs an API call under the shared retry engine: backoff, retry budget and circuit breaker."""
+        request = func(*args, **kwargs)
+        # A response still fresh in the cache costs no quota and no round trip
+        fresh = self.response_cache.fresh(request.uri)
+        if fresh is not None:
+            return json.loads(fresh)
+        try:
+            # methodId looks like 'youtube.videos.list'; each resource has its own breaker
+            return self.retries.call_blocking(
+                request.methodId.split('.')[1],
+                lambda: self._execute(request),
+                classify_googleapi_error,
+                self.config.retry_policy(),
+            )
+        except HttpError as e:
+            if QUOTA_REASONS.intersection(api_error_reasons(e.content)):
+                self.quota.mark_exhausted()
+                raise QuotaExceededError("YouTube API daily quota exceeded")
+            raise
+        except TransportPoolTimeout:
+            raise
+        except TimeoutError as e:
+            raise YouTubeFetcherError(f"API call timed out: {e}")
+        except CONNECTION_ERRORS as e:
+            raise YouTubeFetcherError(f"Connection failed: {e}")
 
     def _extract_video_id(self, video_url: str) -> Optional[str]:
         """Extracts video ID from various YouTube URL formats."""
-        if not self._validate_url(video_url):
-            return None
-            
-        parsed_url = urlparse(video_url)
-        
-        # Handle youtu.be format
-        if parsed_url.netloc == 'youtu.be':
-            return parsed_url.path.lstrip('/')
-        
-        # Handle youtube.com/watch format
-        if 'watch' in parsed_url.path:
-            return parse_qs(parsed_url.query).get('v', [None])[0]
-        
-        # Handle youtube.com/embed format
-        if '/embed/' in parsed_url.path:
-            return parsed_url.path.split('/embed/')[-1]
-            
-        return None
+        return parse_video_id(video_url)
 
     def _extract_channel_id(self, youtube_link: str) -> Optional[str]:
         """Enhanced channel ID extraction with better error handling."""
-        if not self._validate_url(youtube_link):
+        target = route_link(youtube_link)
+        if target.platform != YOUTUBE:
             logger.error(f"Invalid YouTube URL: {youtube_link}")
             return None
 
-        parsed_url = urlparse(youtube_link)
-        path_parts = parsed_url.path.split('/')
-
         channel_id = None
         
         try:
             # Handle video URLs
-            if 'watch' in parsed_url.path:
-                video_id = self._extract_video_id(youtube_link)
-                if video_id:
-                    video_details = self._get_video_details([video_id])
-                    if video_details:
-                        channel_id = video_details[0].get('snippet', {}).get('channelId')
+            if target.kind == VIDEO:
+                video_details = self._get_video_details([target.value])
+                if video_details:
+                    channel_id = video_details[0].get('snippet', {}).get('channelId')
             
             # Handle direct channel URLs
-            elif '/channel/' in parsed_url.path:
-                channel_id = path_parts[-1]
+            elif target.kind == CHANNEL:
+                channel_id = target.value
             
             # Handle @ handles
-            elif parsed_url.path.startswith('/@'):
-                handle = parsed_url.path[2:]  # Remove the leading /@
-                logger.info(f"Extracted handle: {handle}")
-                channel_id = self._search_channel_by_handle(handle)
-                
-                # Additional fallback: try to construct channel URL and test it
-                if not channel_id:
-                    logger.info(f"Search failed, trying direct URL construction")
-                    channel_id = self._try_direct_handle_resolution(handle)
+            elif target.kind == HANDLE:
+                logger.info(f"Extracted handle: {target.value}")
+                channel_id = self._cached_resolve(
+                    handle_cache_key(HANDLE, target.value), lambda: self._resolve_handle(target.value)
+                )
             
             # Handle legacy formats (/c/, /user/)
-            elif any(x in parsed_url.path for x in ['/c/', '/user/']):
-                query = path_parts[-1]
-                channel_id = self._search_channel_by_query(query)
+            elif target.kind in (CUSTOM_URL, USER):
+                channel_id = self._cached_resolve(
+                    handle_cache_key(target.kind, target.value), lambda: self._search_channel_by_query(target.value)
+                )
                 
+        except REFUSED_ERRORS:
+            raise
         except Exception as e:
             logger.error(f"Error extracting channel ID from {youtube_link}: {e}")
+
+        if channel_id:
             logger.info(f"Successfully extracted channel ID: {channel_id}")
         else:
             logger.error(f"Failed to extract channel ID from {youtube_link}")
             
         return channel_id
 
-    def test_api_connection(self) -> bool:
-        """Test if the API connection is working properly."""
-        try:
-            # Try a simple API call to test connectivity
-            response = self.youtube.search().list(
-                q="test",
-                type='channel',
-                part='snippet',
-                maxResults=1
-            ).execute()
-            
-            logger.info("API connection test successful")
-            return True
-        except Exception as e:
-            logger.error(f"API connection test failed: {e}")
-            return False
+    def _cached_resolve(self, cache_key: str, resolve) -> Optional[str]:
+        """Resolves a handle or custom URL through the channel ID cache."""
+        cached = self.channel_cache.get(cache_key)
+        if cached is not MISSING:
+            logger.info(f"Channel ID cache hit for {cache_key}: {cached}")
+            return cached
+        
+        channel_id = resolve()
+        self.channel_cache.set(cache_key, channel_id)
+        return channel_id
 
-    def _search_channel_by_handle(self, handle: str) -> Optional[str]:
-        """Search for channel by handle with multiple strategies."""
+    def _resolve_handle(self, handle: str) -> Optional[str]:
+        """Resolves a handle: cheap lookups raced first, searches only as a budgeted fallback."""
         clean_handle = handle.lstrip('@')
         logger.info(f"Searching for channel with handle: {clean_handle}")
         
-        # First, test if API is working
-        if not self.test_api_connection():
-            logger.error("API connection failed, cannot search for channel")
-            return None
-        
-        # Strategy 1: Try the newer channels.list API with forHandle parameter (YouTube API v3.0+)
+        failure = None
         try:
-            logger.info(f"Trying forHandle API with: @{clean_handle}")
-            response = self._retry_api_call(
-                self.youtube.channels().list,
-                part='snippet,statistics',
-                forHandle=f"@{clean_handle}"
-            )
-            
-            if response.get('items'):
-                channel_id = response['items'][0]['id']
-                logger.info(f"Found channel via forHandle: {channel_id}")
+            channel_id = self._race_cheap_lookups(clean_handle)
+            if channel_id:
                 return channel_id
-        except HttpError as e:
-            logger.warning(f"forHandle API failed (expected for older API versions): {e}")
-        except Exception as e:
-            logger.warning(f"forHandle API error: {e}")
-        
-        # Strategy 2: Try forUsername for legacy usernames
+        except ResolutionFailed as e:
+            failure = e
+
+        channel_id = self._run_search_fallbacks(clean_handle)
+        if channel_id is None and failure is not None:
+            raise failure
+        return channel_id
+
+    def _race_cheap_lookups(self, clean_handle: str) -> Optional[str]:
+        """Runs the 1-unit forHandle and forUsername lookups concurrently; a forHandle hit always wins."""
+        lookups = {
+            'for_handle': lambda: self._lookup_channel(forHandle=f"@{clean_handle}"),
+            'for_username': lambda: self._lookup_channel(forUsername=clean_handle),
+        }
+        futures = {
+            name: self._lookup_executor.submit(copy_context().run, lookup) for name, lookup in lookups.items()
+        }
+        try:
+            # A legacy username can belong to another channel, so it only counts once forHandle comes back empty
+            for name in CHEAP_STRATEGIES:
+                channel_id = futures[name].result()
+                self.planner.record(name, bool(channel_id))
+                if channel_id:
+                    logger.info(f"Found channel via {name}: {channel_id}")
+                    return channel_id
+        finally:
+            # A lookup still running is not waited for; it costs one unit and finishes on its own
+            for future in futures.values():
+                future.cancel()
+        return None
+
+    def _lookup_channel(self, **lookup) -> Optional[str]:
+        """channels.list by forHandle or forUsername; returns the channel ID or None."""
         try:
-            logger.info(f"Trying forUsername API with: {clean_handle}")
             response = self._retry_api_call(
-                self.youtube.channels().list,
-                part='snippet,statistics',
-                forUsername=clean_handle
+                self.youtube.channels().list, part='id', **lookup, **self.config.fields('channel_lookup')
             )
-            
             if response.get('items'):
-                channel_id = response['items'][0]['id']
-                logger.info(f"Found channel via forUsername: {channel_id}")
-                return channel_id
-        except HttpError as e:
-            logger.info(f"forUsername API failed: {e}")
+                return response['items'][0]['id']
+        except REFUSED_ERRORS:
+            raise
         except Exception as e:
-            logger.warning(f"forUsername API error: {e}")
+            logger.warning(f"Channel lookup {lookup} failed: {e}")
+            raise ResolutionFailed(f"Channel lookup {lookup} failed: {e}") from e
+        return None
+
+    def _run_search_fallbacks(self, clean_handle: str) -> Optional[str]:
+        """Tries the 100-unit search strategies, best performers first, within the search budget."""
+        strategies = {
+            'basic_search': self._basic_search,
+            'quoted_search': self._quoted_search,
+            'variant_search': self._try_direct_handle_resolution,
+        }
+        spent = 0
+        failure = None
+        for name in self.planner.search_order():
+            if spent + quota_cost('search') > self.planner.search_budget:
+                logger.info(f"Search budget of {self.planner.search_budget} units spent for handle: {clean_handle}")
+                break
+            if name == 'variant_search' and not handle_search_variant(clean_handle):
+                continue
+            
+            spent += quota_cost('search')
+            try:
+                channel_id = strategies[name](clean_handle)
+            except ResolutionFailed as e:
+                failure = e
+                continue
+            self.planner.record(name, bool(channel_id))
+            if channel_id:
+                return channel_id
         
-        # Strategy 3: Basic search - simplified approach
+        logger.error(f"All search strategies failed for handle: {clean_handle}")
+        if failure is not None:
+            raise failure
+        return None
+
+    def _basic_search(self, clean_handle: str) -> Optional[str]:
+        """search.list for the handle, picking the best title match."""
         try:
             logger.info(f"Trying basic search for: {clean_handle}")
-            response = self.youtube.search().list(
+            response = self._retry_api_call(
+                self.youtube.search().list,
                 q=clean_handle,
                 type='channel',
                 part='snippet',
-                maxResults=10
-            ).execute()
+                maxResults=10,
+                **self.config.fields('channel_search')
+            )
             
             logger.info(f"Basic search returned {len(response.get('items', []))} results")
-            
-            if response.get('items'):
-                # Look through results for best match
-                for item in response['items']:
-                    channel_id = item['id']['channelId']
-                    title = item['snippet']['title']
-                    
-                    logger.info(f"Found result: '{title}' -> {channel_id}")
-                    
-                    # Check for reasonable matches
-                    title_lower = title.lower()
-                    handle_lower = clean_handle.lower()
-                    
-                    if (handle_lower in title_lower or
-                        title_lower in handle_lower or
-                        any(word in title_lower for word in handle_lower.split()) and len(handle_lower.split()) > 1):
-                        
-                        logger.info(f"Matched channel: {title} -> {channel_id}")
-                        return channel_id
-                
-                # If no good match found, return first result as fallback
-                first_result = response['items'][0]
-                first_channel_id = first_result['id']['channelId']
-                first_title = first_result['snippet']['title']
-                logger.info(f"Using first result as fallback: {first_title} -> {first_channel_id}")
-                return first_channel_id
+            return pick_channel_search_match(response.get('items', []), clean_handle)
                 
+        except REFUSED_ERRORS:
+            raise
         except Exception as e:
             logger.error(f"Basic search failed: {e}")
-        
-        # Strategy 4: Try with quotes for exact match
+            raise ResolutionFailed(f"Basic search failed: {e}") from e
+
+    def _quoted_search(self, clean_handle: str) -> Optional[str]:
+        """search.list for the quoted handle, taking the top result."""
         try:
             logger.info(f"Trying quoted search for: \"{clean_handle}\"")
-            response = self.youtube.search().list(
+            response = self._retry_api_call(
+                self.youtube.search().list,
                 q=f'"{clean_handle}"',
                 type='channel',
                 part='snippet',
-                maxResults=5
-            ).execute()
+                maxResults=5,
+                **self.config.fields('channel_search')
+            )
             
             if response.get('items'):
                 channel_id = response['items'][0]['id']['channelId']
@@ -329,48 +662,45 @@ class YouTubeFetcher:
                 logger.info(f"Found via quoted search: {title} -> {channel_id}")
                 return channel_id
                 
+        except REFUSED_ERRORS:
+            raise
         except Exception as e:
             logger.error(f"Quoted search failed: {e}")
-        
-        logger.error(f"All search strategies failed for handle: {clean_handle}")
+            raise ResolutionFailed(f"Quoted search failed: {e}") from e
         return None
 
     def _try_direct_handle_resolution(self, handle: str) -> Optional[str]:
-        """Try to resolve handle by testing different variations."""
+        """Searches for the handle with '_' and '-' as spaces, requiring a title match."""
         clean_handle = handle.lstrip('@')
-        logger.info(f"Attempting direct handle resolution for: {clean_handle}")
+        query = handle_search_variant(clean_handle)
+        if not query:
+            return None
         
-        # Try searching using the handle and its basic transformations
-        search_queries = [
-            clean_handle,
-            clean_handle.replace('_', ' '),
-            clean_handle.replace('-', ' '),
-            clean_handle.lower(),
-        ]
+        try:
+            logger.info(f"Trying direct handle resolution with query: {query}")
+            response = self._retry_api_call(
+                self.youtube.search().list,
+                q=query,
+                type='channel',
+                part='snippet',
+                maxResults=3,
+                **self.config.fields('channel_search')
+            )
 
-        for query in search_queries:
-            try:
-                logger.info(f"Trying direct handle resolution with query: {query}")
-                response = self.youtube.search().list(
-                    q=query,
-                    type='channel',
-                    part='snippet',
-                    maxResults=3
-                ).execute()
-
-                if response.get('items'):
-                    for item in response['items']:
-                        channel_id = item['id']['channelId']
-                        title = item['snippet']['title']
-
-                        # Check if the handle or its transformation is in the title
-                        if clean_handle.lower() in title.lower() or query.lower() in title.lower():
-                            logger.info(f"Direct resolution found match: {title} -> {channel_id}")
-                            return channel_id
-
-            except Exception as e:
-                logger.debug(f"Direct resolution failed for query '{query}': {e}")
-                continue
+            for item in response.get('items', []):
+                channel_id = item['id']['channelId']
+                title = item['snippet']['title']
+
+                # Check if the handle or its transformation is in the title
+                if clean_handle.lower() in title.lower() or query.lower() in title.lower():
+                    logger.info(f"Direct resolution found match: {title} -> {channel_id}")
+                    return channel_id
+
+        except REFUSED_ERRORS:
+            raise
+        except Exception as e:
+            logger.debug(f"Direct resolution failed for query '{query}': {e}")
+            raise ResolutionFailed(f"Direct resolution failed for query '{query}': {e}") from e
 
         logger.info(f"Direct handle resolution failed for: {clean_handle}")
         return None
@@ -383,131 +713,187 @@ class YouTubeFetcher:
                 q=query,
                 type='channel',
                 part='id',
-                maxResults=5
+                maxResults=5,
+                **self.config.fields('channel_search')
             )
             
             if response.get('items'):
                 return response['items'][0]['id']['channelId']
         except HttpError as e:
             logger.error(f"Error searching for channel by query '{query}': {e}")
+            raise ResolutionFailed(f"Search for channel by query '{query}' failed: {e}") from e
         return None
 
     def _get_channel_uploads_playlist_id(self, channel_id: str) -> Optional[str]:
         """Retrieves the uploads playlist ID for a channel."""
         try:
-            response = self._retry_api_call(
-                self.youtube.channels().list,
-                part='contentDetails',
-                id=channel_id
-            )
-            
-            if response.get('items'):
-                return response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
+            channel = self._get_channel(channel_id, 'contentDetails', 'channel_uploads')
+            if channel:
+                return uploads_playlist_id(channel)
         except HttpError as e:
             logger.error(f"API error getting uploads playlist for channel {channel_id}: {e}")
         return None
 
-    def _get_video_ids_from_playlist(self, playlist_id: str, max_results: int = None) -> List[str]:
-        """Retrieves video IDs from a playlist with pagination."""
+    def _iter_playlist_video_id_pages(self, playlist_id: str, max_results: int = None) -> Iterator[List[str]]:
+        """Yields each playlistItems page of video IDs as soon as it is fetched."""
         if max_results is None:
             max_results = self.config.max_videos
             
-        video_ids = []
+        fetched = 0
+        page_token = None
         try:
-            request = self.youtube.playlistItems().list(
-                part='contentDetails',
-                playlistId=playlist_id,
-                maxResults=min(max_results, 50)
-            )
-            
-            while request and len(video_ids) < max_results:
-                response = request.execute()
-                batch_ids = [item['contentDetails']['videoId'] for item in response.get('items', [])]
-                video_ids.extend(batch_ids)
-                
-                if len(video_ids) >= max_results:
-                    video_ids = video_ids[:max_results]
-                    break
+            while fetched < max_results:
+                params = playlist_page_params(self.config, playlist_id, max_results, page_token)
+                response = self._retry_api_call(self.youtube.playlistItems().list, **params)
+                batch_ids = playlist_page_video_ids(response, max_results - fetched)
+                fetched += len(batch_ids)
+                if batch_ids:
+                    yield batch_ids
                     
-                request = self.youtube.playlistItems().list_next(request, response)
+                page_token = response.get('nextPageToken')
+                if not page_token:
+                    break
                 
         except HttpError as e:
             logger.error(f"API error for playlist {playlist_id}: {e}")
-            
-        return video_ids
 
-    def _get_video_details(self, video_ids: List[str]) -> List[Dict[str, Any]]:
-        """Retrieves detailed information for video IDs in batches."""
+    def _get_playlist_video_details(self, playlist_id: str, max_results: int = None) -> List[Dict[str, Any]]:
+        """Pipelines playlist paging with videos.list: each page's details are fetched while the next page loads."""
+        with ThreadPoolExecutor(max_workers=self.config.max_concurrent_video_batches) as executor:
+            futures = [
+                executor.submit(copy_context().run, self._get_summary_details, page_ids)
+                for page_ids in self._iter_playlist_video_id_pages(playlist_id, max_results)
+            ]
+            return [video for future in futures for video in future.result()]
+
+    def _get_summary_details(self, video_ids: List[str]) -> List[Dict[str, Any]]:
+        """Fetches the upload summary: full details, or statistics only in two-pass mode."""
+        part, call_site = summary_details_request(self.config)
+        return self._get_video_details(video_ids, part=part, call_site=call_site)
+
+    def _get_selected_details(self, most_popular: List[Dict[str, Any]], least_popular: List[Dict[str, Any]]):
+        """Second pass of two-pass mode: full details for just the selected videos."""
+        if not self.config.two_pass_details:
+            return most_popular, least_popular
+        detailed = self._get_video_details(selected_video_ids(most_popular, least_popular))
+        return merge_selected_details(most_popular, least_popular, detailed)
+
+    def _get_video_details(self, video_ids: List[str], part: str = VIDEO_DETAIL_PARTS,
+                           call_site: str = 'video_details') -> List[Dict[str, Any]]:
+        """Retrieves detailed information for video IDs, batched with concurrent lookups."""
         if not video_ids:
             return []
             
-        details = []
         try:
-            for i in range(0, len(video_ids), 50):
-                chunk = video_ids[i:i + 50]
-                response = self._retry_api_call(
-                    self.youtube.videos().list,
-                    part='snippet,statistics,contentDetails',
-                    id=','.join(chunk)
-                )
-                details.extend(response.get('items', []))
+            found = self._load_ids('videos', video_ids, part=part, **self.config.fields(call_site))
         except HttpError as e:
             logger.error(f"API error getting video details: {e}")
-            
-        return details
-
-    def _get_comments_for_video(self, video_id: str, max_comments: int = None) -> List[Dict[str, Any]]:
-        """Retrieves comments for a video with better error handling."""
-        if not self.config.enable_comments:
             return []
             
-        if max_comments is None:
-            max_comments = self.config.max_comments_per_video
-            
-        comments = []
+        return found_items(found)
+
+    def _get_channel(self, channel_id: str, part: str, call_site: str) -> Optional[Dict[str, Any]]:
+        """Retrieves one channel, batched with concurrent lookups; None if it does not exist."""
+        found = self._load_ids('channels', [channel_id], part=part, **self.config.fields(call_site))
+        return found[channel_id]
+
+    def _load_ids(self, resource: str, ids: List[str], **params) -> Dict[str, Any]:
+        """Looks IDs up through the batcher, except those prefetch answered or the cache holds fresh."""
+        known = self.known_items.get(batch_key(resource, params), {})
+        missing = [item_id for item_id in ids if item_id not in known]
+        if missing:
+            # Freshness is per ID; only stale or unseen IDs join a combined call
+            known = {**known, **self.response_cache.fresh_items(resource, missing, params)}
+            missing = [item_id for item_id in missing if item_id not in known]
+        found = self.id_batcher.load_many(resource, missing, **params) if missing else {}
+        return {item_id: known[item_id] if item_id in known else found[item_id] for item_id in ids}
+
+    def prefetch(self, links: List[str]) -> "YouTubeFetcher":
+        """Looks up the videos and channels behind many links in shared 50-ID calls.
+
+        Returns a copy of this fetcher that answers those lookups without calling
+        the API again, or this fetcher unchanged if the lookups fail.
+        """
+        video_ids, channel_ids = link_lookup_ids(links)
+        video_params, channel_params, owner_params = prefetch_params(self.config)
         try:
-            response = self._retry_api_call(
-                self.youtube.commentThreads().list,
-                part='snippet',
-                videoId=video_id,
-                maxResults=min(max_comments, 100),
-                textFormat='plainText'
-            )
-            
-            comments.extend(response.get('items', []))
-            
+            videos = self._load_ids('videos', video_ids, **video_params)
+            channels = self._load_ids('channels', channel_ids, **channel_params)
+            owner_ids = owner_channel_ids(videos)
+            owners = self._load_ids('channels', owner_ids, **owner_params)
+        except Exception as e:
+            # Each analysis can still look up its own IDs
+            logger.warning(f"Prefetching IDs for {len(links)} links failed: {e}")
+            return self
+
+        fetcher = copy.copy(self)
+        fetcher.known_items = {
+            **self.known_items,
+            batch_key('videos', video_params): videos,
+            batch_key('channels', channel_params): channels,
+            batch_key('channels', owner_params): owners,
+        }
+        return fetcher
+
+    def _fetch_ids(self, resource: str, ids: List[str], params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Issues one combined list call for up to 50 IDs on behalf of the batcher."""
+        list_method = getattr(self.youtube, resource)().list
+        response = self._retry_api_call(list_method, id=','.join(ids), **params)
+        items = response.get('items', [])
+        # A single-ID call is cached whole by the transport; combined calls are cached per item
+        if len(ids) > 1:
+            self.response_cache.store_items(resource, params, items)
+        return items
+
+    def iter_comment_pages(self, video_id: str, max_comments: int = None) -> Iterator[List[Dict[str, Any]]]:
+        """Yields pages of comment threads for a video as they arrive, up to the per-video cap."""
+        if not self.config.enable_comments:
+            return
+
+        max_comments = comment_limit(self.config, max_comments)
+        fetched = 0
+        page_token = None
+        try:
+            while fetched < max_comments:
+                params = comment_page_params(self.config, video_id, max_comments - fetched, page_token)
+                # Bounds comment pages in flight across every video being fetched
+                with self._comment_page_slots:
+                    response = self._retry_api_call(self.youtube.commentThreads().list, **params)
+                
+                items = response.get('items', [])[:max_comments - fetched]
+                fetched += len(items)
+                if items:
+                    yield items
+                
+                page_token = response.get('nextPageToken')
+                if not page_token:
+                    break
+                    
         except HttpError as e:
-            if e.resp.status == 403 and 'commentsDisabled' in str(e.content):
+            if 'commentsDisabled' in api_error_reasons(e.content):
                 logger.info(f"Comments disabled for video {video_id}")
             else:
                 logger.error(f"API error getting comments for video {video_id}: {e}")
-                
-        return comments
 
-    def _get_videos_with_comments_concurrent(self, videos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Fetch comments for multiple videos concurrently."""
+    def _get_comments_for_video(self, video_id: str, max_comments: int = None) -> List[Dict[str, Any]]:
+        """Retrieves all comment pages for a video up to the per-video cap."""
+        return [comment for page in self.iter_comment_pages(video_id, max_comments) for comment in page]
+
+    def _iter_comments_for_videos(self, video_ids: List[str]) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """Fetches comments for all videos in one bounded fan-out, yielding each video's as it completes."""
+        video_ids = list(dict.fromkeys(video_ids))
         if not self.config.enable_concurrent_fetching:
-            return self._get_videos_with_comments_sequential(videos)
+            for video_id in video_ids:
+                yield video_id, self._get_comments_for_video(video_id)
+            return
             
-        def fetch_video_with_comments(video):
-            comments = self._get_comments_for_video(video['id'])
-            return {'video': video, 'comments': comments}
-        
         with ThreadPoolExecutor(max_workers=self.config.max_workers) as executor:
-            results = list(executor.map(fetch_video_with_comments, videos))
-            
-        return results
-
-    def _get_videos_with_comments_sequential(self, videos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Fetch comments for videos sequentially (fallback method)."""
-        results = []
-        for video in videos:
-            comments = self._get_comments_for_video(video['id'])
-            results.append({'video': video, 'comments': comments})
-        return results
+            futures = {executor.submit(copy_context().run, self._get_comments_for_video, video_id): video_id for video_id in video_ids}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
 
-    def get_channel_data(self, channel_link: str) -> Dict[str, Any]:
-        """Enhanced main function to fetch channel data."""
+    def iter_channel_data(self, channel_link: str) -> Iterator[Dict[str, Any]]:
+        """Yields the channel analysis section by section: channel, videos, then comments per video."""
         logger.info(f"Starting data fetch for channel: {channel_link}")
         
         try:
@@ -516,64 +902,42 @@ class YouTubeFetcher:
                 raise YouTubeFetcherError(f"Could not extract channel ID from {channel_link}")
 
             # Get channel details
-            channel_response = self._retry_api_call(
-                self.youtube.channels().list,
-                part='snippet,statistics,contentDetails',
-                id=channel_id
-            )
-            
-            if not channel_response.get('items'):
+            channel_details = self._get_channel(channel_id, CHANNEL_DETAIL_PARTS, 'channel_details')
+            if not channel_details:
                 raise YouTubeFetcherError(f"Channel {channel_id} not found")
-
-            channel_details = channel_response['items'][0]
+            yield channel_section(channel_id, channel_details)
             
-            # Get video data
-            uploads_playlist_id = self._get_channel_uploads_playlist_id(channel_id)
-            if not uploads_playlist_id:
+            # The details already carry the uploads playlist unless a field mask dropped it
+            playlist_id = uploads_playlist_id(channel_details) or self._get_channel_uploads_playlist_id(channel_id)
+            if not playlist_id:
                 raise YouTubeFetcherError(f"Could not find uploads playlist for channel {channel_id}")
 
-            video_ids = self._get_video_ids_from_playlist(uploads_playlist_id)
-            if not video_ids:
+            video_details = self._get_playlist_video_details(playlist_id)
+            if not video_details:
                 logger.warning(f"No videos found for channel {channel_id}")
-                return {
-                    "channel_id": channel_id,
-                    "channel_details": channel_details,
-                    "all_videos_summary": [],
-                    "most_popular_videos_with_comments": [],
-                    "least_popular_videos_with_comments": []
-                }
-
-            video_details = self._get_video_details(video_ids)
-            
-            # Sort by view count (handle missing statistics gracefully)
-            video_details.sort(
-                key=lambda x: int(x.get('statistics', {}).get('viewCount', 0)), 
-                reverse=True
-            )
 
-            # Get top and bottom videos
-            popular_count = min(self.config.popular_videos_count, len(video_details))
-            least_popular_count = min(self.config.least_popular_videos_count, len(video_details))
-            
-            most_popular = video_details[:popular_count]
-            least_popular = video_details[-least_popular_count:] if len(video_details) > popular_count else []
+            most_popular, least_popular = select_popularity_extremes(video_details, self.config)
+            most_popular, least_popular = self._get_selected_details(most_popular, least_popular)
+            yield videos_section(video_details, most_popular, least_popular)
 
-            return {
-                "channel_id": channel_id,
-                "channel_details": channel_details,
-                "all_videos_summary": video_details,
-                "most_popular_videos_with_comments": self._get_videos_with_comments_concurrent(most_popular),
-                "least_popular_videos_with_comments": self._get_videos_with_comments_concurrent(least_popular)
-            }
+            # One fan-out for both sets; videos in both are fetched once
+            for video_id, comments in self._iter_comments_for_videos(selected_video_ids(most_popular, least_popular)):
+                yield comments_section(video_id, comments)
 
         except YouTubeFetcherError:
             raise
+        except REFUSED_ERRORS:
+            raise
         except Exception as e:
             logger.exception(f"Unexpected error for channel {channel_link}")
             raise YouTubeFetcherError(f"Unexpected error: {str(e)}")
 
-    def get_video_data(self, video_link: str) -> Dict[str, Any]:
-        """Simplified function to fetch data for a single video and its channel."""
+    def get_channel_data(self, channel_link: str) -> Dict[str, Any]:
+        """Enhanced main function to fetch channel data."""
+        return assemble_channel_data(self.iter_channel_data(channel_link))
+
+    def iter_video_data(self, video_link: str) -> Iterator[Dict[str, Any]]:
+        """Yields the video analysis section by section: video, channel, then its comments."""
         logger.info(f"Starting simplified data fetch for video: {video_link}")
         
         try:
@@ -590,30 +954,24 @@ class YouTubeFetcher:
             
             if not channel_id:
                 raise YouTubeFetcherError(f"Could not determine channel ID for video {video_id}")
+            yield video_section(channel_id, current_video_details)
 
             # Fetch basic channel details
-            channel_response = self._retry_api_call(
-                self.youtube.channels().list,
-                part='snippet,statistics',
-                id=channel_id
-            )
-            
-            channel_details = channel_response['items'][0] if channel_response.get('items') else None
+            channel_details = self._get_channel(channel_id, OWNER_CHANNEL_PARTS, 'channel_details')
+            yield owner_section(channel_details)
 
             # Get comments for the current video
             current_video_comments = self._get_comments_for_video(video_id)
-
-            return {
-                "channel_id": channel_id,
-                "channel_details": channel_details,
-                "current_video_details": current_video_details,
-                "current_video_comments": current_video_comments
-            }
+            yield comments_section(video_id, current_video_comments)
 
         except YouTubeFetcherError:
             raise
+        except REFUSED_ERRORS:
+            raise
         except Exception as e:
             logger.exception(f"Unexpected error for video {video_link}")
             raise YouTubeFetcherError(f"Unexpected error: {str(e)}")
 
-    
\ No newline at end of file
+    def get_video_data(self, video_link: str) -> Dict[str, Any]:
+        """Simplified function to fetch data for a single video and its channel."""
+        return assemble_video_data(self.iter_video_data(video_link))
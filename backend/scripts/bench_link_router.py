@@ -0,0 +1,51 @@
+"""Micro-benchmark of per-link routing cost.
+
+Compares the old per-consumer urlparse calls with route_link, both cold (the
+LRU cleared before each pass) and memoized. Run from backend/:
+
+    python -m scripts.bench_link_router
+"""
+from urllib.parse import parse_qs, urlparse
+import timeit
+from app.services.links import route_link
+
+LINKS = [
+    "https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=42s",
+    "https://youtu.be/dQw4w9WgXcQ?si=abc123",
+    "https://m.youtube.com/watch?v=dQw4w9WgXcQ",
+    "https://music.youtube.com/watch?v=dQw4w9WgXcQ&list=RDAMVM",
+    "https://www.youtube.com/shorts/aBcDeFgHiJk",
+    "https://www.youtube.com/live/aBcDeFgHiJk?feature=share",
+    "https://www.youtube.com/@SomeHandle/videos",
+    "https://www.youtube.com/channel/UC_x5XG1OV2P6uZZ5FSM9Ttw",
+    "https://www.youtube.com/c/SomeCustomName",
+    "https://www.youtube.com/user/someuser",
+    "https://www.facebook.com/somepage",
+    "https://example.com/not-a-platform",
+]
+
+def legacy_route(link):
+    # What one /analyze request used to do: analyzer, then fetcher validation and extraction
+    hostname = urlparse(link).hostname
+    path = urlparse(link).path
+    if "youtube.com" in hostname or "youtu.be" in hostname:
+        parsed = urlparse(link)
+        if parsed.netloc in ['www.youtube.com', 'youtube.com', 'youtu.be']:
+            parsed = urlparse(link)
+            if 'watch' in parsed.path:
+                return parse_qs(parsed.query).get('v', [None])[0]
+            return path.split('/')[-1]
+    return None
+
+def cold_route(link):
+    route_link.cache_clear()
+    return route_link(link)
+
+def bench(name, func, number=20000):
+    seconds = min(timeit.repeat(lambda: [func(link) for link in LINKS], number=number, repeat=5))
+    print(f"{name:<28}{seconds / (number * len(LINKS)) * 1e9:>10.0f} ns/link")
+
+if __name__ == "__main__":
+    bench("legacy urlparse x4", legacy_route)
+    bench("route_link, cold", cold_route)
+    bench("route_link, memoized", route_link)
@@ -0,0 +1,78 @@
+import asyncio
+import threading
+from app.services.batcher import BlockingIdBatcher, IdBatcher
+from app.services.quota import BATCH, INTERACTIVE, quota_priority
+
+def _items(ids):
+    return [{"id": item_id} for item_id in ids]
+
+async def _lookup(batcher, item_id, priority):
+    quota_priority.set(priority)
+    return await batcher.load_many("videos", [item_id], part="id")
+
+def _run_async(priorities):
+    seen = []
+
+    async def fetch(resource, ids, params):
+        seen.append(quota_priority.get())
+        return _items(ids)
+
+    async def main():
+        batcher = IdBatcher(fetch, window=0.01)
+        # Tasks run in copies of this context, so each caller's priority stays its own
+        results = await asyncio.gather(*(
+            asyncio.create_task(_lookup(batcher, f"v{i}", priority)) for i, priority in enumerate(priorities)
+        ))
+        return results, batcher.stats.snapshot()["calls"]
+
+    results, calls = asyncio.run(main())
+    assert calls == 1
+    assert [list(result) for result in results] == [[f"v{i}"] for i in range(len(priorities))]
+    return seen
+
+def test_async_batch_opened_by_background_caller_runs_interactive_when_one_joins():
+    assert _run_async([BATCH, INTERACTIVE]) == [INTERACTIVE]
+
+def test_async_batch_opened_by_interactive_caller_stays_interactive():
+    assert _run_async([INTERACTIVE, BATCH]) == [INTERACTIVE]
+
+def test_async_batch_of_background_callers_runs_at_batch_priority():
+    assert _run_async([BATCH, BATCH]) == [BATCH]
+
+def test_async_flush_does_not_leak_priority_into_the_opening_caller():
+    async def fetch(resource, ids, params):
+        return _items(ids)
+
+    async def main():
+        batcher = IdBatcher(fetch, window=0.01)
+        quota_priority.set(BATCH)
+        await batcher.load_many("videos", ["v1"], part="id")
+        return quota_priority.get()
+
+    assert asyncio.run(main()) == BATCH
+
+def test_blocking_batch_runs_at_the_most_urgent_joined_priority():
+    seen = []
+    leader_waiting = threading.Event()
+
+    def fetch(resource, ids, params):
+        seen.append((quota_priority.get(), sorted(ids)))
+        return _items(ids)
+
+    batcher = BlockingIdBatcher(fetch, window=0.2)
+
+    def lookup(item_id, priority, started=None):
+        quota_priority.set(priority)
+        if started is not None:
+            started.set()
+        batcher.load_many("videos", [item_id], part="id")
+
+    leader = threading.Thread(target=lookup, args=("v1", BATCH, leader_waiting))
+    leader.start()
+    leader_waiting.wait()
+    follower = threading.Thread(target=lookup, args=("v2", INTERACTIVE))
+    follower.start()
+    leader.join()
+    follower.join()
+
+    assert seen == [(INTERACTIVE, ["v1", "v2"])]
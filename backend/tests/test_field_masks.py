@@ -0,0 +1,39 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services.youtube_client import FIELD_MASKS, ID_MATCHED_SITES, FetchConfig, check_field_mask_sites
+
+@pytest.mark.parametrize("site", sorted(ID_MATCHED_SITES))
+def test_default_masks_keep_items_id(site):
+    check_field_mask_sites({site: FIELD_MASKS[site]})
+
+@pytest.mark.parametrize("mask", ["items", "items(id,snippet)", "items/id,items/snippet", "items/*", "*"])
+def test_masks_selecting_items_id_are_accepted(mask):
+    check_field_mask_sites({"video_details": mask})
+
+@pytest.mark.parametrize("site", sorted(ID_MATCHED_SITES))
+def test_masks_dropping_items_id_are_rejected(site):
+    with pytest.raises(ValueError, match="items/id"):
+        check_field_mask_sites({site: "items(snippet)"})
+
+def test_sites_not_matched_by_id_may_drop_it():
+    check_field_mask_sites({"playlist_items": "nextPageToken,items/contentDetails/videoId"})
+
+def test_null_mask_fetches_whole_parts():
+    check_field_mask_sites({"video_details": None})
+
+def test_malformed_mask_is_rejected():
+    with pytest.raises(ValueError, match="Malformed"):
+        check_field_mask_sites({"channel_details": "items(id"})
+
+def test_unknown_call_site_is_rejected():
+    with pytest.raises(ValueError, match="Unknown"):
+        FetchConfig(field_masks={"nope": "items"})
+
+def test_analyze_rejects_mask_without_items_id_with_422():
+    response = TestClient(app).post(
+        "/analyze", json={"link": "https://youtu.be/abc", "field_masks": {"video_details": "items(snippet)"}}
+    )
+
+    assert response.status_code == 422
+    assert "items/id" in response.text
@@ -0,0 +1,87 @@
+import sqlite3
+import time
+from app.services.jobs import DONE, QUEUED, RUNNING, JobStore
+
+SECTION = {"event": "video", "data": {"channel_id": "UC1"}}
+
+def _stores(tmp_path, lease_ttl=60.0):
+    path = str(tmp_path / "jobs.sqlite3")
+    return JobStore(path, lease_ttl=lease_ttl), JobStore(path, lease_ttl=lease_ttl)
+
+def _status(store, job_id):
+    return store.get(job_id)["status"]
+
+def test_a_job_is_claimed_by_one_process_only(tmp_path):
+    first, second = _stores(tmp_path)
+    job_id = first.create("https://youtu.be/abc", None)
+
+    assert first.claim(job_id)
+    assert not second.claim(job_id)
+    assert _status(second, job_id) == RUNNING
+
+def test_recover_leaves_jobs_with_a_live_lease_alone(tmp_path):
+    first, second = _stores(tmp_path)
+    running = first.create("https://youtu.be/abc", None)
+    queued = first.create("https://youtu.be/def", None)
+    first.claim(running)
+    first.add_section(running, 0, SECTION)
+
+    assert [job[0] for job in second.recover()] == [queued]
+    assert _status(second, running) == RUNNING
+    assert second.sections(running) == [SECTION]
+
+def test_recover_requeues_jobs_whose_lease_lapsed(tmp_path):
+    first, second = _stores(tmp_path, lease_ttl=0.01)
+    job_id = first.create("https://youtu.be/abc", {"video_details": None})
+    first.claim(job_id)
+    first.add_section(job_id, 0, SECTION)
+    time.sleep(0.02)
+
+    assert second.recover() == [(job_id, "https://youtu.be/abc", {"video_details": None})]
+    assert _status(second, job_id) == QUEUED
+    assert second.sections(job_id) == []
+    assert second.claim(job_id)
+
+def test_renewed_lease_keeps_the_job(tmp_path):
+    first, second = _stores(tmp_path, lease_ttl=0.05)
+    job_id = first.create("https://youtu.be/abc", None)
+    first.claim(job_id)
+    time.sleep(0.03)
+    assert first.renew_leases() == 1
+    time.sleep(0.03)
+
+    assert second.requeue_expired() == []
+
+def test_writes_after_losing_the_lease_are_dropped(tmp_path):
+    first, second = _stores(tmp_path, lease_ttl=0.01)
+    job_id = first.create("https://youtu.be/abc", None)
+    first.claim(job_id)
+    time.sleep(0.02)
+    second.requeue_expired()
+    second.claim(job_id)
+
+    assert not first.add_section(job_id, 0, SECTION)
+    assert not first.finish(job_id, DONE, result={"stale": True})
+    assert second.finish(job_id, DONE, result={"fresh": True})
+    assert second.get(job_id)["result"] == {"fresh": True}
+
+def test_released_leases_are_recovered_on_the_next_start(tmp_path):
+    first, second = _stores(tmp_path)
+    job_id = first.create("https://youtu.be/abc", None)
+    first.claim(job_id)
+    first.release_leases()
+
+    assert [job[0] for job in second.recover()] == [job_id]
+
+def test_journal_without_lease_columns_is_migrated(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    db = sqlite3.connect(path)
+    db.execute(
+        "CREATE TABLE jobs (id TEXT PRIMARY KEY, link TEXT NOT NULL, field_masks TEXT, status TEXT NOT NULL,"
+        " result TEXT, error TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+    )
+    db.execute("INSERT INTO jobs VALUES ('old', 'https://youtu.be/abc', 'null', 'running', NULL, NULL, 0, 0)")
+    db.commit()
+    db.close()
+
+    assert JobStore(path).recover() == [("old", "https://youtu.be/abc", None)]
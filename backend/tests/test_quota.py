@@ -0,0 +1,45 @@
+import pytest
+from app.services.quota import BATCH, INTERACTIVE, QuotaExceededError, QuotaScheduler
+
+def _scheduler(path, daily_budget=10):
+    return QuotaScheduler(daily_budget=daily_budget, refill_per_second=1000.0, burst=1000,
+                          interactive_reserve=0.0, max_wait=1.0, path=str(path))
+
+def test_usage_survives_a_restart(tmp_path):
+    path = tmp_path / "quota.sqlite3"
+    _scheduler(path).acquire_blocking('videos', INTERACTIVE)
+    _scheduler(path).acquire_blocking('videos', INTERACTIVE)
+
+    assert _scheduler(path).stats()["used_today"] == 2
+
+def test_processes_sharing_the_store_share_one_budget(tmp_path):
+    path = tmp_path / "quota.sqlite3"
+    first, second = _scheduler(path), _scheduler(path)
+    for _ in range(6):
+        first.acquire_blocking('videos', BATCH)
+    for _ in range(4):
+        second.acquire_blocking('videos', BATCH)
+
+    # Neither charged all 10 units itself; the shared store did
+    with pytest.raises(QuotaExceededError, match="10/10"):
+        second.acquire_blocking('videos', BATCH)
+    with pytest.raises(QuotaExceededError):
+        first.acquire_blocking('videos', BATCH)
+    assert first.stats()["used_today"] == 10
+
+def test_reported_exhaustion_is_shared(tmp_path):
+    path = tmp_path / "quota.sqlite3"
+    first, second = _scheduler(path), _scheduler(path)
+    first.mark_exhausted()
+
+    with pytest.raises(QuotaExceededError):
+        second.acquire_blocking('channels', INTERACTIVE)
+
+def test_usage_is_kept_per_quota_day(tmp_path, monkeypatch):
+    path = tmp_path / "quota.sqlite3"
+    scheduler = _scheduler(path, daily_budget=200)
+    scheduler.acquire_blocking('search', INTERACTIVE)
+    assert scheduler.stats()["used_today"] == 100
+
+    monkeypatch.setattr(QuotaScheduler, "_quota_day", staticmethod(lambda: "2999-01-01"))
+    assert _scheduler(path, daily_budget=200).stats()["used_today"] == 0
@@ -0,0 +1,60 @@
+import asyncio
+import time
+import pytest
+from app.services.youtube_async_client import AsyncYouTubeFetcher
+from app.services.youtube_client import YouTubeFetcher
+
+# forHandle answers after forUsername, so a fetcher taking the first hit would pick the username
+HANDLE_DELAY = 0.05
+
+def _results(handle_hit, username_hit):
+    return {'forHandle': handle_hit, 'forUsername': username_hit}
+
+def _sync_fetcher(handle_hit, username_hit):
+    fetcher = YouTubeFetcher("test-key")
+    results = _results(handle_hit, username_hit)
+
+    def lookup(**params):
+        (name, _), = params.items()
+        if name == 'forHandle':
+            time.sleep(HANDLE_DELAY)
+        return results[name]
+
+    fetcher._lookup_channel = lookup
+    return fetcher
+
+def _async_fetcher(handle_hit, username_hit):
+    fetcher = AsyncYouTubeFetcher("test-key")
+    results = _results(handle_hit, username_hit)
+
+    async def lookup(**params):
+        (name, _), = params.items()
+        if name == 'forHandle':
+            await asyncio.sleep(HANDLE_DELAY)
+        return results[name]
+
+    fetcher._lookup_channel = lookup
+    return fetcher
+
+def _race_sync(handle_hit, username_hit):
+    fetcher = _sync_fetcher(handle_hit, username_hit)
+    try:
+        return fetcher._race_cheap_lookups("somehandle")
+    finally:
+        fetcher.close()
+
+def _race_async(handle_hit, username_hit):
+    return asyncio.run(_async_fetcher(handle_hit, username_hit)._race_cheap_lookups("somehandle"))
+
+@pytest.fixture(params=[_race_sync, _race_async], ids=["blocking", "async"])
+def race(request):
+    return request.param
+
+def test_handle_hit_wins_over_earlier_username_hit(race):
+    assert race("UChandle", "UCusername") == "UChandle"
+
+def test_username_hit_used_once_handle_comes_back_empty(race):
+    assert race(None, "UCusername") == "UCusername"
+
+def test_no_hit_returns_none(race):
+    assert race(None, None) is None
@@ -0,0 +1,143 @@
+import asyncio
+import socket
+import threading
+import pytest
+from app.services.result_cache import RedisResultStore, ResultCache, ResultStoreError
+
+class RespServer:
+    """Minimal stand-in for a Redis-protocol server: AUTH, SELECT, GET and SET with PX."""
+
+    def __init__(self, password=None):
+        self.password = password
+        self.data = {}
+        self.commands = []
+        self.connections = 0
+        # Set to an error line (without the leading '-') to fail every command
+        self.fail_with = None
+        self._clients = []
+        self._listener = socket.create_server(("127.0.0.1", 0))
+        self.port = self._listener.getsockname()[1]
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self._listener.accept()
+            except OSError:
+                return
+            self.connections += 1
+            self._clients.append(conn)
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        reader = conn.makefile('rb')
+        try:
+            while True:
+                line = reader.readline()
+                if not line:
+                    return
+                args = []
+                for _ in range(int(line[1:-2])):
+                    length = int(reader.readline()[1:-2])
+                    args.append(reader.read(length + 2)[:-2])
+                self.commands.append(args)
+                conn.sendall(self._reply(args))
+        except OSError:
+            return
+
+    def _reply(self, args):
+        if self.fail_with is not None:
+            return b"-" + self.fail_with + b"\r\n"
+        name = args[0].upper()
+        if name == b"AUTH":
+            return b"+OK\r\n" if args[1].decode() == self.password else b"-WRONGPASS invalid password\r\n"
+        if name == b"SELECT":
+            return b"+OK\r\n"
+        if name == b"GET":
+            value = self.data.get(args[1])
+            return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+        if name == b"SET":
+            self.data[args[1]] = args[2]
+            return b"+OK\r\n"
+        return b"-ERR unknown command\r\n"
+
+    def drop_connections(self):
+        """Closes every client socket, as a restarting server would."""
+        for conn in self._clients:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            conn.close()
+        self._clients = []
+
+    def close(self):
+        self.drop_connections()
+        self._listener.close()
+
+@pytest.fixture
+def server():
+    server = RespServer(password="secret")
+    yield server
+    server.close()
+
+@pytest.fixture
+def store(server):
+    store = RedisResultStore(f"redis://:secret@127.0.0.1:{server.port}/0")
+    yield store
+    store.close()
+
+def test_get_miss_returns_none(store):
+    assert store.get("missing") is None
+
+def test_set_sends_px_and_get_hits(store, server):
+    store.set("key", b'{"value": 1}', 1.5)
+
+    assert server.commands[-1] == [b"SET", b"audience_pulse:result:key", b'{"value": 1}', b"PX", b"1500"]
+    assert store.get("key") == b'{"value": 1}'
+
+def test_auth_and_select_come_from_the_url(server):
+    store = RedisResultStore(f"redis://:secret@127.0.0.1:{server.port}/3")
+    try:
+        store.get("key")
+    finally:
+        store.close()
+
+    assert server.commands[:2] == [[b"AUTH", b"secret"], [b"SELECT", b"3"]]
+
+def test_error_reply_raises_result_store_error(store, server):
+    store.get("key")
+    server.fail_with = b"ERR something broke"
+
+    with pytest.raises(ResultStoreError, match="something broke"):
+        store.get("key")
+
+def test_reconnects_after_server_drops_the_connection(store, server):
+    store.set("key", b"value", 60)
+    server.drop_connections()
+
+    with pytest.raises(ResultStoreError):
+        store.get("key")
+    assert store.get("key") == b"value"
+    assert server.connections == 2
+    # The new connection authenticates again
+    assert server.commands.count([b"AUTH", b"secret"]) == 2
+
+def test_unreachable_server_raises_result_store_error():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    store = RedisResultStore(f"redis://127.0.0.1:{port}")
+
+    with pytest.raises(ResultStoreError, match="unavailable"):
+        store.get("key")
+
+def test_result_cache_treats_store_errors_as_misses(store, server):
+    server.fail_with = b"ERR down"
+    cache = ResultCache(store, max_entries=10, ttl=60, stale_ttl=60, beta=1.0)
+
+    async def compute():
+        return {"answer": 42}
+
+    assert asyncio.run(cache.get_or_compute("key", compute)) == {"answer": 42}
+    assert cache.stats()["store_errors"] == 2